@@ -0,0 +1,165 @@
+# hybrid_pipeline.py
+# Pipelined quantum sampling + MTS. Instead of resolving the sample future
+# before mts_quant1 starts, the MTS loop starts on a random (or given)
+# population right away, while a background thread waits on the sample
+# batches. Each finished batch is converted with counts_to_population and
+# streamed into the population between tabu runs, through the same
+# replace-a-random-member-if-better rule as tabu results.
+#
+# Injection points depend on when batches finish, so runs with sample
+# sources are not bit-reproducible for a fixed seed.
+import queue
+import threading
+import time
+
+import numpy as np
+
+from labs_batch import labs_energy_batch
+from labs_store import resolve_target_E
+from mts_core import init_population, make_child, insert_result, tabu_search_pm1, pm1_to_bits01
+from sample_population import counts_to_population
+
+
+def start_sample_batches(kernel, N, layers, trained_params, n_batches, shots_per_batch):
+    """Launch n_batches cudaq.sample_async jobs on the trained ansatz; returns the handles."""
+    import cudaq
+
+    return [
+        cudaq.sample_async(kernel, N, layers, trained_params, shots_count=shots_per_batch)
+        for _ in range(n_batches)
+    ]
+
+
+def _resolve_source(source):
+    """Counts from a counts mapping, an async handle (.get()) or a callable."""
+    if hasattr(source, "items"):
+        return source
+    if hasattr(source, "get"):
+        return source.get()
+    return source()
+
+
+def _sample_worker(sources, out: queue.Queue, N, sample_options):
+    for b, source in enumerate(sources):
+        t0 = time.time()
+        try:
+            pop = counts_to_population(_resolve_source(source), **sample_options)
+        except Exception as exc:  # surfaced by the MTS loop
+            out.put((b, exc, time.time() - t0))
+            continue
+        if pop.size and pop.shape[1] != N:
+            out.put((b, ValueError(f"batch {b} has length {pop.shape[1]}, expected N={N}"),
+                     time.time() - t0))
+            continue
+        out.put((b, pop, time.time() - t0))
+
+
+def mts_pipelined(
+    N: int,
+    sample_sources=(),
+    pop_size: int = 32,
+    initial_pop: np.ndarray = None,
+    p_combine: float = 0.7,
+    p_mut: float = 1.0/50.0,
+    mts_iters: int = 1000,
+    tabu_iters: int = 800,
+    tabu_tenure: int = 30,
+    candidate_size: int = 64,
+    target_E: int | str | None = None, # "known": best-known E from labs_store
+    seed: int = 0,
+    verbose_every: int = 100,
+    sample_options: dict | None = None,
+):
+    """
+    mts_quant1 that absorbs quantum samples while it runs.
+
+    sample_sources: sample batches in any mix of counts mappings, cudaq async
+    handles (e.g. from start_sample_batches) or zero-argument callables
+    returning counts. They are resolved in order on a background thread.
+    sample_options go to counts_to_population (default: dedupe=True).
+
+    Returns the mts_quant1 keys plus "sample_batches" (one entry per batch
+    absorbed: tabu run, samples, accepted, best sample E, wait time) and
+    "pending_batches" (batches that had not finished when MTS stopped).
+    """
+    target_E = resolve_target_E(N, target_E)
+    sample_options = {"dedupe": True} if sample_options is None else dict(sample_options)
+    sources = list(sample_sources)
+
+    rng = np.random.default_rng(seed)
+    pop, pop_E = init_population(N, pop_size, initial_pop, rng, verbose_every > 0)
+    best_idx = int(np.argmin(pop_E))
+    best_s = pop[best_idx].copy()
+    best_E = int(pop_E[best_idx])
+
+    arrivals = queue.Queue()
+    if sources:
+        threading.Thread(
+            target=_sample_worker, args=(sources, arrivals, N, sample_options), daemon=True
+        ).start()
+
+    batch_log = []
+    trace = [best_E]
+    t0 = time.time()
+
+    def absorb(tabu_run):
+        nonlocal best_s, best_E
+        while True:
+            try:
+                b, samples, wait = arrivals.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(samples, Exception):
+                raise samples
+            n_ok = 0
+            if len(samples):
+                E = labs_energy_batch(samples).astype(np.int64)
+                for s, e in zip(samples, E):
+                    before = pop_E.sum()
+                    best_s, best_E = insert_result(pop, pop_E, best_s, best_E, s, int(e), rng)
+                    n_ok += int(pop_E.sum() != before)
+            batch_log.append({
+                "batch": b,
+                "tabu_run": tabu_run,
+                "n_samples": len(samples),
+                "n_accepted": n_ok,
+                "best_sample_E": int(E.min()) if len(samples) else None,
+                "resolve_sec": wait,
+            })
+            if verbose_every:
+                print(f"[Pipeline] batch {b} absorbed at run {tabu_run}: "
+                      f"{len(samples)} samples, {n_ok} accepted, best_E={best_E}")
+
+    for it in range(1, mts_iters + 1):
+        absorb(it - 1)
+        if target_E is not None and best_E <= target_E:
+            break
+
+        child = make_child(pop, pop_size, p_combine, p_mut, rng)
+        result_s, result_E = tabu_search_pm1(
+            child,
+            max_iters=tabu_iters,
+            tabu_tenure=tabu_tenure,
+            candidate_size=candidate_size,
+            rng=rng,
+            target_E=target_E,
+        )
+        best_s, best_E = insert_result(pop, pop_E, best_s, best_E, result_s, result_E, rng)
+        trace.append(best_E)
+
+        if verbose_every and (it % verbose_every == 0):
+            print(f"[MTS {it:5d}] best_E={best_E}  elapsed={time.time()-t0:.2f}s")
+    else:
+        absorb(mts_iters)
+
+    return {
+        "best_s_pm1": best_s,
+        "best_s_01": pm1_to_bits01(best_s),
+        "best_E": best_E,
+        "best_trace": np.array(trace, dtype=np.int64),
+        "population_pm1": pop,
+        "population_E": pop_E.copy(),
+        "elapsed_sec": time.time() - t0,
+        "sample_batches": batch_log,
+        "pending_batches": len(sources) - len(batch_log),
+    }
@@ -0,0 +1,89 @@
+# labs_batch.py
+# Batched LABS energy kernel: score a whole (B, N) population of ±1 rows at once
+# instead of calling labs_energy_pm1 once per row.
+import numpy as np
+
+# FFT autocorrelation vs the per-lag loop (numpy 2.4, one core): for batches
+# up to FFT_SMALL_B rows the loop's per-lag call overhead dominates and the
+# FFT is faster from N = 16 (B = 64, N = 96: 0.14 ms vs 0.58 ms); for larger
+# batches the two are within noise until N ~ 128-256, so FFT_MIN_N is a
+# conservative default there
+FFT_MIN_N = 128
+FFT_SMALL_B = 128
+FFT_SMALL_MIN_N = 16
+# large batches of single-word sequences are cheapest bit-packed (labs_bitpack)
+PACKED_MIN_B = 1024
+PACKED_MAX_N = 64
+
+
+def as_pm1_matrix(S) -> np.ndarray:
+    """Promote a single sequence or a list of sequences to a 2D int8 (B, N) array."""
+    S = np.asarray(S, dtype=np.int8)
+    if S.ndim == 1:
+        S = S[None, :]
+    if S.ndim != 2:
+        raise ValueError(f"expected a (B, N) matrix of ±1 spins, got shape {S.shape}")
+    return S
+
+
+def _correlations_direct(S: np.ndarray) -> np.ndarray:
+    """One vectorized dot product per lag, each over all B rows."""
+    B, N = S.shape
+    S32 = S.astype(np.int32)
+    C = np.empty((B, N - 1), dtype=np.int32)
+    for k in range(1, N):
+        C[:, k - 1] = np.einsum("bi,bi->b", S32[:, :-k], S32[:, k:])
+    return C
+
+
+def _correlations_fft(S: np.ndarray) -> np.ndarray:
+    """Aperiodic autocorrelation via zero-padded real FFT, O(B N log N)."""
+    B, N = S.shape
+    nfft = 1 << int(2 * N - 1).bit_length()
+    F = np.fft.rfft(S.astype(np.float64), n=nfft, axis=1)
+    acf = np.fft.irfft(F * np.conj(F), n=nfft, axis=1)
+    return np.rint(acf[:, 1:N]).astype(np.int32)
+
+
+def labs_correlations_batch(S, method: str = "auto") -> np.ndarray:
+    """
+    C[b, k-1] = C_k of row b for k=1..N-1.
+    method: "direct" (per-lag loop vectorized over rows), "fft", "packed"
+    (XOR + popcount on 64-bit words), or "auto".
+    """
+    S = as_pm1_matrix(S)
+    B, N = S.shape
+    if N < 2:
+        return np.zeros((B, 0), dtype=np.int32)
+    if method == "auto":
+        if N >= FFT_MIN_N or (B <= FFT_SMALL_B and N >= FFT_SMALL_MIN_N):
+            method = "fft"
+        elif B >= PACKED_MIN_B and N <= PACKED_MAX_N:
+            method = "packed"
+        else:
+            method = "direct"
+    if method == "direct":
+        return _correlations_direct(S)
+    if method == "fft":
+        return _correlations_fft(S)
+    if method == "packed":
+        from labs_bitpack import pack_pm1, packed_correlations
+        return packed_correlations(pack_pm1(S), N)
+    raise ValueError(f"unknown method {method!r}, expected 'auto', 'direct', 'fft' or 'packed'")
+
+
+def labs_energy_from_C_batch(C: np.ndarray) -> np.ndarray:
+    C64 = C.astype(np.int64)
+    return np.sum(C64 * C64, axis=1)
+
+
+def labs_energy_batch(S, method: str = "auto", return_C: bool = False):
+    """
+    Energies of all rows of S in one pass.
+    Returns E with shape (B,), or (E, C) when return_C is set.
+    """
+    C = labs_correlations_batch(S, method=method)
+    E = labs_energy_from_C_batch(C)
+    if return_C:
+        return E, C
+    return E
@@ -0,0 +1,289 @@
+# labs_benchmark.py
+# Time-to-solution (TTS) benchmark for MTS, random vs quantum-seeded.
+# Runs mts_quant1 over a grid of N x seeds with the best-known energy from
+# labs_store as the target, then reports per-(N, source) statistics, an
+# exponential fit TTS ~ a * kappa^N, and JSON / CSV files that can be diffed
+# between commits with compare_results.
+#
+#   python labs_benchmark.py --N 10 12 14 16 --seeds 20 --out bench/run
+#   python labs_benchmark.py --N 21 25 29 --skew --out bench/skew
+#
+# The command line only runs random populations. Quantum seeding is API-only,
+# because the sampler needs trained ansatz parameters for each N. Pass a
+# sources dict, for example:
+#   run_tts_benchmark(Ns, sources={"random": None, "mps": lambda N, seed:
+#       sample_population_mps(N, layers, trained[N], 32, seed=seed)})
+#
+# A group with no hits has an infinite TTS99; it is written as null, so the
+# JSON stays strict.
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import time
+
+import numpy as np
+
+from labs_skew import skew_optimum
+from labs_store import best_known_energy
+from mts_core import mts_quant1
+
+RECORD_FIELDS = ("N", "source", "seed", "target_E", "best_E", "hit",
+                 "iters_to_target", "time_to_target_sec", "elapsed_sec")
+
+
+# -------------------------
+# 1) Runs
+# -------------------------
+def _tts_record(N: int, label: str, seed: int, target_E: int, res: dict) -> dict:
+    hit_at = np.flatnonzero(res["best_trace"] <= target_E)
+    hit = bool(hit_at.size)
+    return {
+        "N": N,
+        "source": label,
+        "seed": int(seed),
+        "target_E": int(target_E),
+        "best_E": int(res["best_E"]),
+        "hit": hit,
+        "iters_to_target": int(hit_at[0]) if hit else None,
+        "time_to_target_sec": res["elapsed_sec"] if hit else None,
+        "elapsed_sec": res["elapsed_sec"],
+    }
+
+
+def run_tts_benchmark(
+    Ns,
+    seeds=range(10),
+    sources=None,
+    mts_kwargs=None,
+    store_path: str | None = None,
+    verbose: bool = True,
+) -> list[dict]:
+    """
+    One mts_quant1 run per (N, source, seed), stopping at the best-known
+    energy for N. sources maps a label to None (random population) or to
+    initial_pop_fn(N, seed) -> (B, N) ±1 array (e.g. QITE samples).
+    mts_kwargs go to mts_quant1 (mts_iters is the per-run budget).
+    """
+    sources = {"random": None} if sources is None else sources
+    mts_kwargs = dict(mts_kwargs or {})
+    mts_kwargs.setdefault("verbose_every", 0)
+    records = []
+    for N in Ns:
+        target_E = best_known_energy(N, store_path)
+        if target_E is None:
+            raise ValueError(f"no best-known energy for N={N} in the result store")
+        for label, initial_pop_fn in sources.items():
+            for seed in seeds:
+                initial_pop = None if initial_pop_fn is None else initial_pop_fn(N, seed)
+                res = mts_quant1(N, initial_pop=initial_pop, target_E=target_E, seed=seed,
+                                 **mts_kwargs)
+                records.append(_tts_record(N, label, seed, target_E, res))
+            if verbose:
+                rs = [r for r in records if r["N"] == N and r["source"] == label]
+                print(f"[TTS] N={N:3d} {label:>8s}: {sum(r['hit'] for r in rs)}/{len(rs)} hit "
+                      f"E={target_E}")
+    return records
+
+
+def run_skew_benchmark(
+    Ns,
+    seeds=range(10),
+    mts_kwargs=None,
+    store_path: str | None = None,
+    verbose: bool = True,
+) -> list[dict]:
+    """
+    Full vs skew-symmetric MTS for odd N, same records as run_tts_benchmark
+    with sources "full" and "skew". Full runs target the best-known energy;
+    skew runs target the best skew-symmetric energy (exhaustive, skew_optimum),
+    which is higher when no optimum of that N is skew-symmetric.
+    """
+    mts_kwargs = dict(mts_kwargs or {})
+    mts_kwargs.setdefault("verbose_every", 0)
+    records = []
+    for N in Ns:
+        full_E = best_known_energy(N, store_path)
+        if full_E is None:
+            raise ValueError(f"no best-known energy for N={N} in the result store")
+        targets = {"full": full_E, "skew": skew_optimum(N)["best_E"]}
+        for label, target_E in targets.items():
+            for seed in seeds:
+                res = mts_quant1(N, target_E=target_E, seed=seed, skew=(label == "skew"),
+                                 **mts_kwargs)
+                records.append(_tts_record(N, label, seed, target_E, res))
+            if verbose:
+                rs = [r for r in records if r["N"] == N and r["source"] == label]
+                print(f"[TTS] N={N:3d} {label:>8s}: {sum(r['hit'] for r in rs)}/{len(rs)} hit "
+                      f"E={target_E}")
+    return records
+
+
+# -------------------------
+# 2) Statistics
+# -------------------------
+def tts_at_confidence(run_times, p_success, confidence=0.99):
+    """
+    Expected time to see a hit with the given confidence from independent
+    restarts: t_run * log(1 - confidence) / log(1 - p).
+    """
+    if p_success <= 0:
+        return float("inf")
+    t_run = float(np.mean(run_times))
+    if p_success >= 1:
+        return t_run
+    return t_run * np.log(1 - confidence) / np.log(1 - p_success)
+
+
+def summarize(records: list[dict]) -> list[dict]:
+    """Per (N, source): success rate, TTS / iterations quantiles, TTS99."""
+    groups = {}
+    for r in records:
+        groups.setdefault((r["N"], r["source"]), []).append(r)
+
+    summary = []
+    for (N, source), rs in sorted(groups.items()):
+        hits = [r for r in rs if r["hit"]]
+        tts = np.array([r["time_to_target_sec"] for r in hits], dtype=float)
+        iters = np.array([r["iters_to_target"] for r in hits], dtype=float)
+        p = len(hits) / len(rs)
+        row = {"N": N, "source": source, "runs": len(rs), "success_rate": p}
+        if hits:
+            q25, med, q75 = np.percentile(tts, [25, 50, 75])
+            row.update({
+                "median_tts_sec": float(med),
+                "q25_tts_sec": float(q25),
+                "q75_tts_sec": float(q75),
+                "mean_tts_sec": float(tts.mean()),
+                "std_tts_sec": float(tts.std(ddof=1)) if len(tts) > 1 else 0.0,
+                "median_iters": float(np.median(iters)),
+                "mean_iters": float(iters.mean()),
+            })
+        else:
+            row.update({k: None for k in ("median_tts_sec", "q25_tts_sec", "q75_tts_sec",
+                                          "mean_tts_sec", "std_tts_sec", "median_iters",
+                                          "mean_iters")})
+        tts99 = tts_at_confidence([r["elapsed_sec"] for r in rs], p)
+        row["tts99_sec"] = float(tts99) if np.isfinite(tts99) else None  # None: no hits
+        summary.append(row)
+    return summary
+
+
+def fit_scaling(summary: list[dict], source: str, key: str = "median_tts_sec") -> dict | None:
+    """
+    Least-squares fit of log(key) = log(a) + N * log(kappa) over the Ns of
+    one source. None if fewer than two Ns have a finite, positive value.
+    """
+    pts = [(r["N"], r[key]) for r in summary
+           if r["source"] == source and r[key] is not None and np.isfinite(r[key]) and r[key] > 0]
+    if len(pts) < 2:
+        return None
+    N, y = np.array(pts, dtype=float).T
+    log_y = np.log(y)
+    slope, intercept = np.polyfit(N, log_y, 1)
+    resid = log_y - (intercept + slope * N)
+    ss_tot = np.sum((log_y - log_y.mean())**2)
+    return {
+        "source": source,
+        "metric": key,
+        "kappa": float(np.exp(slope)),
+        "log_kappa": float(slope),
+        "a": float(np.exp(intercept)),
+        "r2": float(1 - np.sum(resid**2) / ss_tot) if ss_tot > 0 else 1.0,
+        "Ns": [int(n) for n in N],
+    }
+
+
+# -------------------------
+# 3) Files & regression comparison
+# -------------------------
+def _run_metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=10,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_results(prefix: str, records, summary=None, fits=None, config=None) -> dict:
+    """Write <prefix>.json (everything) and <prefix>.csv (one row per run)."""
+    summary = summarize(records) if summary is None else summary
+    if fits is None:
+        fits = [f for f in (fit_scaling(summary, s) for s in sorted({r["source"] for r in records}))
+                if f is not None]
+    doc = {"meta": _run_metadata(), "config": config or {}, "records": records,
+           "summary": summary, "fits": fits}
+    os.makedirs(os.path.dirname(os.path.abspath(prefix)), exist_ok=True)
+    with open(prefix + ".json", "w") as f:
+        json.dump(doc, f, indent=1, default=float, allow_nan=False)
+    with open(prefix + ".csv", "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=RECORD_FIELDS)
+        w.writeheader()
+        w.writerows(records)
+    return doc
+
+
+def compare_results(old, new, key: str = "median_tts_sec") -> list[dict]:
+    """
+    Per (N, source) present in both result files (paths or loaded dicts):
+    old / new values of key and the speedup old / new.
+    """
+    docs = []
+    for d in (old, new):
+        if isinstance(d, str):
+            with open(d) as f:
+                d = json.load(f)
+        docs.append({(r["N"], r["source"]): r for r in d["summary"]})
+    rows = []
+    for k in sorted(docs[0].keys() & docs[1].keys()):
+        a, b = docs[0][k][key], docs[1][k][key]
+        rows.append({
+            "N": k[0], "source": k[1], "old": a, "new": b,
+            "speedup": a / b if a is not None and b else None,
+        })
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="MTS time-to-solution benchmark")
+    ap.add_argument("--N", type=int, nargs="+", required=True)
+    ap.add_argument("--seeds", type=int, default=10)
+    ap.add_argument("--pop-size", type=int, default=32)
+    ap.add_argument("--mts-iters", type=int, default=1000)
+    ap.add_argument("--tabu-iters", type=int, default=800)
+    ap.add_argument("--out", default="bench/tts")
+    ap.add_argument("--compare", default=None, help="earlier .json to compare against")
+    ap.add_argument("--skew", action="store_true",
+                    help="compare full vs skew-symmetric search (odd N) instead")
+    args = ap.parse_args(argv)
+
+    config = {"pop_size": args.pop_size, "mts_iters": args.mts_iters,
+              "tabu_iters": args.tabu_iters}
+    run = run_skew_benchmark if args.skew else run_tts_benchmark
+    records = run(args.N, range(args.seeds), mts_kwargs=config)
+    doc = write_results(args.out, records, config=config)
+    for row in doc["summary"]:
+        tts99 = "inf" if row["tts99_sec"] is None else f"{row['tts99_sec']:.3g}s"
+        print(f"N={row['N']:3d} {row['source']:>8s} p={row['success_rate']:.2f} "
+              f"median={row['median_tts_sec']} tts99={tts99}")
+    for fit in doc["fits"]:
+        print(f"{fit['source']}: TTS ~ {fit['a']:.3g} * {fit['kappa']:.4f}^N (r2={fit['r2']:.3f})")
+    if args.compare:
+        for row in compare_results(args.compare, doc):
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# labs_bitpack.py
+# Bit-packed ±1 sequences: bit i of a row is 1 where s_i = -1, stored
+# little-endian in W = ceil(N/64) uint64 words per row (8x less memory than int8).
+# s_i * s_{i+k} = -1 exactly when bits i and i+k differ, so
+#   C_k = (N - k) - 2 * popcount((x ^ (x >> k)) & low_mask(N - k)).
+import numpy as np
+
+from labs_batch import as_pm1_matrix
+
+WORD = 64
+
+
+def n_words(N: int) -> int:
+    return max(1, -(-N // WORD))
+
+
+def pack_pm1(S) -> np.ndarray:
+    """(B, N) ±1 -> (B, W) uint64."""
+    S = as_pm1_matrix(S)
+    B, N = S.shape
+    W = n_words(N)
+    bits = np.zeros((B, W * WORD), dtype=np.uint8)
+    bits[:, :N] = S < 0
+    packed = np.packbits(bits, axis=1, bitorder="little")
+    return np.ascontiguousarray(packed).view("<u8").astype(np.uint64, copy=False)
+
+
+def unpack_pm1(P: np.ndarray, N: int) -> np.ndarray:
+    """(B, W) uint64 -> (B, N) int8 ±1."""
+    P = np.ascontiguousarray(np.atleast_2d(P), dtype="<u8")
+    bits = np.unpackbits(P.view(np.uint8), axis=1, count=N, bitorder="little")
+    return (1 - 2 * bits.astype(np.int8)).astype(np.int8)
+
+
+if hasattr(np, "bitwise_count"):
+    def popcount64(x: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(x)
+else:
+    _POP8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount64(x: np.ndarray) -> np.ndarray:
+        x = np.ascontiguousarray(x, dtype="<u8")
+        return _POP8[x.view(np.uint8)].reshape(x.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+def _low_masks(N: int) -> np.ndarray:
+    """masks[k] = (W,) words with the low N - k bits set, k = 0..N-1."""
+    W = n_words(N)
+    bits = np.arange(W * WORD)[None, :] < (N - np.arange(N))[:, None]
+    packed = np.packbits(bits.astype(np.uint8), axis=1, bitorder="little")
+    return np.ascontiguousarray(packed).view("<u8").astype(np.uint64, copy=False)
+
+
+def _shift_right(P: np.ndarray, k: int) -> np.ndarray:
+    """Logical right shift of each (W,)-word row by k bits."""
+    q, r = divmod(k, WORD)
+    W = P.shape[1]
+    out = np.zeros_like(P)
+    if q >= W:
+        return out
+    src = P[:, q:]
+    if r == 0:
+        out[:, :W - q] = src
+        return out
+    out[:, :W - q] = src >> np.uint64(r)
+    out[:, :W - q - 1] |= src[:, 1:] << np.uint64(WORD - r)
+    return out
+
+
+def packed_correlations(P: np.ndarray, N: int) -> np.ndarray:
+    """C[b, k-1] = C_k, k = 1..N-1; same layout as labs_correlations_batch."""
+    P = np.atleast_2d(P)
+    masks = _low_masks(N)
+    C = np.empty((P.shape[0], max(0, N - 1)), dtype=np.int32)
+    if P.shape[1] == 1:
+        # single word: plain shifts, no cross-word carry
+        x = P[:, 0]
+        for k in range(1, N):
+            diff = (x ^ (x >> np.uint64(k))) & masks[k, 0]
+            C[:, k - 1] = (N - k) - 2 * popcount64(diff).astype(np.int32)
+        return C
+    for k in range(1, N):
+        diff = (P ^ _shift_right(P, k)) & masks[k]
+        C[:, k - 1] = (N - k) - 2 * popcount64(diff).sum(axis=1, dtype=np.int32)
+    return C
+
+
+def packed_energy(P: np.ndarray, N: int) -> np.ndarray:
+    C = packed_correlations(P, N).astype(np.int64)
+    return np.sum(C * C, axis=1)
+
+
+def packed_flip(P: np.ndarray, j: int) -> None:
+    """Flip spin j of every row in place."""
+    P[:, j // WORD] ^= np.uint64(1) << np.uint64(j % WORD)
+
+
+def packed_flip_energies(p: np.ndarray, N: int) -> np.ndarray:
+    """Energies of all N single-flip neighbours of one packed row p (W,)."""
+    p = np.asarray(p, dtype=np.uint64).reshape(1, -1)
+    nbrs = np.repeat(p, N, axis=0)
+    j = np.arange(N)
+    nbrs[j, j // WORD] ^= np.uint64(1) << (j % WORD).astype(np.uint64)
+    return packed_energy(nbrs, N)
@@ -0,0 +1,330 @@
+# labs_exact.py
+# Exact LABS ground truth without materializing 2^N sequences.
+#
+# The first and last n_outer bits of a sequence form its "outer" configuration.
+# Flip / reversal / flip+reverse (dihedral_orbit) act on outer configurations
+# too, so we only need one canonical outer configuration per orbit: ~4x fewer
+# sequences. Each canonical outer configuration is a shard. Inside a shard the
+# middle bits are split into "batch" bits, laid out as rows of a matrix, and
+# "gray" bits, which are walked in Gray-code order. Every Gray step flips the
+# same column in all rows, so C and E are updated with a few array ops per
+# step instead of being recomputed per sequence.
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from labs_batch import labs_correlations_batch, labs_energy_batch
+from symValidator import canonical_form, dihedral_orbit
+
+
+def canonical_outer_configs(N: int, n_outer: int) -> list[tuple]:
+    """Outer configurations (left n_outer bits + right n_outer bits), one per symmetry orbit."""
+    keep = []
+    for cfg in itertools.product([-1, 1], repeat=2 * n_outer):
+        L, R = cfg[:n_outer], cfg[n_outer:]
+        images = [
+            cfg,
+            tuple(-a for a in cfg),                                   # flip
+            R[::-1] + L[::-1],                                        # reverse
+            tuple(-a for a in R[::-1]) + tuple(-a for a in L[::-1]),  # flip+reverse
+        ]
+        if cfg == min(images):
+            keep.append(cfg)
+    return keep
+
+
+def _shard_rows(N: int, n_outer: int, outer_cfgs, n_batch: int) -> np.ndarray:
+    """All (outer config, batch bits) rows with the gray bits set to +1."""
+    n_mid = N - 2 * n_outer
+    n_gray = n_mid - n_batch
+    batch = np.array(list(itertools.product([-1, 1], repeat=n_batch)), dtype=np.int8)
+    batch = batch.reshape(len(batch), n_batch)
+    rows = []
+    for cfg in outer_cfgs:
+        block = np.empty((len(batch), N), dtype=np.int8)
+        block[:, :n_outer] = cfg[:n_outer]
+        block[:, n_outer:n_outer + n_gray] = 1
+        block[:, n_outer + n_gray:N - n_outer] = batch
+        block[:, N - n_outer:] = cfg[n_outer:]
+        rows.append(block)
+    return np.vstack(rows)
+
+
+def _walk_shard(N: int, n_outer: int, outer_cfgs, n_batch: int):
+    """
+    Gray-code walk over one shard. Streams through every sequence once and
+    keeps only the running minimum and the rows that attain it.
+    Returns (best_E, best sequences, sequences visited).
+    """
+    n_gray = N - 2 * n_outer - n_batch
+    S = _shard_rows(N, n_outer, outer_cfgs, n_batch)
+    B = S.shape[0]
+    C = labs_correlations_batch(S, method="direct")
+    E = np.einsum("bk,bk->b", C, C)
+
+    # zero-padded copy so every neighbour slice is in range
+    off = N - 1
+    Sp = np.zeros((B, 3 * N - 2), dtype=np.int8)
+    Sp[:, off:off + N] = S
+
+    best_E = int(E.min())
+    best = [Sp[i, off:off + N].copy() for i in np.flatnonzero(E == best_E)]
+
+    for t in range(1, 1 << n_gray):
+        p = n_outer + ((t & -t).bit_length() - 1)  # bit that changes at Gray step t
+        c = off + p
+        sp = Sp[:, c:c + 1].astype(np.int32)
+        A = Sp[:, c + 1:c + N].astype(np.int32) + Sp[:, c - N + 1:c][:, ::-1]
+        C -= 2 * sp * A
+        Sp[:, c] *= -1
+        E = np.einsum("bk,bk->b", C, C)
+
+        e_min = int(E.min())
+        if e_min <= best_E:
+            if e_min < best_E:
+                best_E, best = e_min, []
+            best.extend(Sp[i, off:off + N].copy() for i in np.flatnonzero(E == best_E))
+
+    return best_E, best, B << n_gray
+
+
+def _merge(parts):
+    """Combine per-shard (best_E, seqs, visited) into the global optimum."""
+    parts = [p for p in parts if p[0] is not None]
+    if not parts:
+        return None, [], 0  # empty shard
+    best_E = min(p[0] for p in parts)
+    canon = set()
+    visited = 0
+    for E, seqs, n in parts:
+        visited += n
+        if E == best_E:
+            canon.update(canonical_form(s) for s in seqs)
+    return best_E, sorted(canon), visited
+
+
+def enumerate_labs_exact(
+    N: int,
+    n_outer: int | None = None,
+    n_batch: int | None = None,
+    n_workers: int = 1,
+    shard: tuple[int, int] = (0, 1),
+):
+    """
+    Exact minimum LABS energy for length N.
+
+    shard=(i, n) restricts the run to every n-th canonical outer configuration
+    starting at i, so one search can be split across machines; merge the
+    results with merge_exact_results. n_workers > 1 spreads the local shards
+    over a process pool.
+
+    Returns a dict with best_E, the optimal sequences in canonical form, the
+    number of optimal sequences in the full 2^N space (orbit sizes summed),
+    sequences visited and wall time.
+    """
+    if N < 2:
+        raise ValueError("LABS needs N >= 2")
+    if n_outer is None:
+        n_outer = min(4, N // 2)
+    n_mid = N - 2 * n_outer
+    if n_batch is None:
+        n_batch = min(n_mid, 10)
+    n_batch = min(n_batch, n_mid)
+
+    t0 = time.time()
+    shard_i, n_shards = shard
+    cfgs = canonical_outer_configs(N, n_outer)[shard_i::n_shards]
+
+    # one task per group of outer configs, enough groups to keep workers busy
+    n_tasks = max(1, min(len(cfgs), 4 * n_workers))
+    groups = [cfgs[g::n_tasks] for g in range(n_tasks)]
+    groups = [g for g in groups if g]
+    if n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [pool.submit(_walk_shard, N, n_outer, g, n_batch) for g in groups]
+            parts = [f.result() for f in futures]
+    else:
+        parts = [_walk_shard(N, n_outer, g, n_batch) for g in groups]
+
+    best_E, canon, visited = _merge(parts)
+    elapsed = time.time() - t0
+    return {
+        "N": N,
+        "best_E": best_E,
+        "optimal_canonical": canon,
+        "n_optimal": sum(len(dihedral_orbit(s)) for s in canon),
+        "visited": visited,
+        "elapsed_sec": elapsed,
+        "seqs_per_sec": visited / elapsed if elapsed > 0 else 0.0,
+        "shard": shard,
+    }
+
+
+def merge_exact_results(results: list[dict]) -> dict:
+    """Merge enumerate_labs_exact results from different shards of the same N."""
+    Ns = {r["N"] for r in results}
+    if len(Ns) != 1:
+        raise ValueError(f"cannot merge results for different N: {sorted(Ns)}")
+    best_E, canon, visited = _merge(
+        [(r["best_E"], r["optimal_canonical"], r["visited"]) for r in results]
+    )
+    elapsed = sum(r["elapsed_sec"] for r in results)
+    return {
+        "N": Ns.pop(),
+        "best_E": best_E,
+        "optimal_canonical": canon,
+        "n_optimal": sum(len(dihedral_orbit(s)) for s in canon),
+        "visited": visited,
+        "elapsed_sec": elapsed,
+        "seqs_per_sec": visited / elapsed if elapsed > 0 else 0.0,
+        "shard": None,
+    }
+
+
+# Branch and bound
+#
+# Bits are assigned from both ends inwards (s[0], s[N-1], s[1], s[N-2], ...).
+# With the free positions held at 0, labs_correlations_batch gives the fixed
+# part of every C_k. If f_k of the N-k products still touch a free bit, then
+#     |C_k| >= max(|fixed_k| - f_k, (N-k) mod 2)
+# (C_k has the parity of N-k), and the sum of the squared bounds is a lower
+# bound on E for the whole subtree. It never decreases as more bits are fixed.
+# Nodes are processed in batches: a depth-first stack of (depth, rows) blocks.
+
+def _assignment_order(N: int) -> np.ndarray:
+    order = []
+    lo, hi = 0, N - 1
+    while lo <= hi:
+        order.append(lo)
+        if hi != lo:
+            order.append(hi)
+        lo, hi = lo + 1, hi - 1
+    return np.array(order)
+
+
+def _free_pair_counts(N: int, assigned: np.ndarray) -> np.ndarray:
+    """f_k: products s[i]*s[i+k] with at least one unassigned factor, k=1..N-1."""
+    mask = np.zeros(N, dtype=np.int8)
+    mask[assigned] = 1
+    both = labs_correlations_batch(mask, method="direct")[0]
+    return (N - np.arange(1, N)) - both
+
+
+def labs_lower_bound_batch(S: np.ndarray, f: np.ndarray) -> np.ndarray:
+    """Energy lower bound for partial rows of S (0 = unassigned), given f_k."""
+    N = S.shape[1]
+    fixed = np.abs(labs_correlations_batch(S, method="direct")).astype(np.int64)
+    parity = (N - np.arange(1, N)) % 2
+    lb = np.maximum(fixed - f, parity)
+    return np.sum(lb * lb, axis=1)
+
+
+def branch_and_bound_labs(
+    N: int,
+    incumbent=None,
+    time_limit: float | None = None,
+    chunk: int = 4096,
+    mts_kwargs: dict | None = None,
+    verbose_every: float = 0,
+):
+    """
+    Exact LABS optimum by branch and bound.
+
+    incumbent: starting ±1 sequence; if None a short mts_quant1 run supplies
+    one (override its settings with mts_kwargs). Subtrees whose bound is not
+    below the incumbent are pruned, so a good incumbent matters.
+
+    The certificate records the starting incumbent (incumbent_E, and
+    incumbent_source "mts" or "given"), whether the tree search found a
+    better sequence (improved_by_search), and whether the tree was exhausted.
+    When it was, lower_bound == best_E and the optimum is proven. When
+    time_limit cut the search short, lower_bound is the smallest bound left
+    on the stack, which is still a valid lower bound on the optimum.
+    """
+    from mts_core import mts_quant1, labs_energy_pm1
+
+    t0 = time.time()
+    if incumbent is None:
+        kw = dict(pop_size=16, mts_iters=max(20, 2 * N), tabu_iters=4 * N, verbose_every=0)
+        kw.update(mts_kwargs or {})
+        res = mts_quant1(N, **kw)
+        best_s, source = np.asarray(res["best_s_pm1"], dtype=np.int8), "mts"
+    else:
+        best_s, source = np.asarray(incumbent, dtype=np.int8).copy(), "given"
+    best_E = labs_energy_pm1(best_s)
+    incumbent_E = best_E
+
+    order = _assignment_order(N)
+    f_by_depth = {}
+
+    # flip symmetry: s[0] = +1 loses nothing
+    root = np.zeros((1, N), dtype=np.int8)
+    root[0, order[0]] = 1
+    stack = [(1, root, 0)]
+    nodes = 1
+    pruned = 0
+    complete = True
+    last_report = t0
+
+    while stack:
+        if time_limit is not None and time.time() - t0 > time_limit:
+            complete = False
+            break
+        depth, S, _ = stack.pop()
+
+        if depth == N:
+            E = labs_energy_batch(S)
+            i = int(np.argmin(E))
+            if E[i] < best_E:
+                best_E, best_s = int(E[i]), S[i].copy()
+            continue
+
+        if depth not in f_by_depth:
+            f_by_depth[depth] = _free_pair_counts(N, order[:depth])
+        lb = labs_lower_bound_batch(S, f_by_depth[depth])
+        keep = lb < best_E
+        pruned += int(S.shape[0] - keep.sum())
+        S, lb = S[keep], lb[keep]
+        if S.shape[0] == 0:
+            continue
+
+        # children: the next one or two positions in the order
+        new_pos = order[depth:depth + 2]
+        n_new = len(new_pos)
+        signs = np.array(list(itertools.product([-1, 1], repeat=n_new)), dtype=np.int8)
+        kids = np.repeat(S, len(signs), axis=0)
+        kids[:, new_pos] = np.tile(signs, (S.shape[0], 1))
+        kid_lb = np.repeat(lb, len(signs))
+        nodes += kids.shape[0]
+
+        # push in reverse so the first chunk is explored first
+        starts = list(range(0, kids.shape[0], chunk))
+        for a in reversed(starts):
+            stack.append((depth + n_new, kids[a:a + chunk], int(kid_lb[a:a + chunk].min())))
+
+        if verbose_every and time.time() - last_report >= verbose_every:
+            last_report = time.time()
+            print(f"[B&B N={N}] best_E={best_E}  nodes={nodes}  stack={len(stack)}  "
+                  f"elapsed={last_report - t0:.1f}s")
+
+    elapsed = time.time() - t0
+    lower_bound = best_E if complete else min([best_E] + [b for _, _, b in stack])
+    return {
+        "N": N,
+        "best_E": int(best_E),
+        "best_s_pm1": best_s,
+        "nodes": nodes,
+        "nodes_per_sec": nodes / elapsed if elapsed > 0 else 0.0,
+        "elapsed_sec": elapsed,
+        "certificate": {
+            "optimal": complete,
+            "lower_bound": int(lower_bound),
+            "incumbent_E": int(incumbent_E),
+            "incumbent_source": source,
+            "improved_by_search": bool(best_E < incumbent_E),
+            "pruned": pruned,
+            "symmetry": "s[0] = +1",
+        },
+    }
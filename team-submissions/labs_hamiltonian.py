@@ -0,0 +1,178 @@
+# labs_hamiltonian.py
+# Closed-form LABS Hamiltonian.
+#
+#   H = sum_k (sum_i Z_i Z_{i+k})^2
+#     = N(N-1)/2 + 2 * sum_k sum_{i<j} Z_i Z_{i+k} Z_j Z_{j+k}
+#
+# A product with j == i+k collapses to the 2-body term Z_i Z_{i+2k}; every
+# other product is a 4-body term on {i, i+k, j, j+k}. A 4-set a<b<c<d with
+# b-a == d-c is produced twice, as (a,b)(c,d) and as (a,c)(b,d), so every
+# 4-body coefficient is 4. Collecting these directly avoids squaring cudaq
+# spin operators and merging the O(N^3) intermediate terms.
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from labs_bitpack import packed_energy
+from labs_interactions import DEFAULT_CACHE_DIR, _atomic_save
+
+
+@lru_cache(maxsize=64)
+def labs_hamiltonian_terms(N: int) -> dict:
+    """
+    Collected Z-term form of the LABS Hamiltonian for N spins:
+      constant, idx2 (M2, 2) with coef2 (M2,), idx4 (M4, 4) with coef4 (M4,).
+    Indices are sorted within each term. Cached per N; arrays are read-only.
+    """
+    two, four = [], []
+    for k in range(1, N):
+        i, j = np.triu_indices(N - k, 1)
+        adj = j == i + k
+        two.append(np.stack([i[adj], i[adj] + 2 * k], axis=1))
+        i, j = i[~adj], j[~adj]
+        four.append(np.sort(np.stack([i, i + k, j, j + k], axis=1), axis=1))
+
+    idx2 = np.concatenate(two) if two else np.zeros((0, 2), dtype=np.int64)
+    # each (i, i+2k) pair arises from exactly one k
+    coef2 = np.full(len(idx2), 2, dtype=np.int64)
+
+    idx4 = np.concatenate(four) if four else np.zeros((0, 4), dtype=np.int64)
+    base = np.array([N**3, N**2, N, 1], dtype=np.int64)
+    keys, first, counts = np.unique(idx4 @ base, return_index=True, return_counts=True)
+    idx4 = idx4[first]
+    coef4 = 2 * counts.astype(np.int64)
+
+    order2 = np.lexsort(idx2.T[::-1]) if len(idx2) else np.zeros(0, dtype=np.int64)
+    terms = {
+        "N": N,
+        "constant": N * (N - 1) // 2,
+        "idx2": idx2[order2].astype(np.int32),
+        "coef2": coef2[order2],
+        "idx4": idx4.astype(np.int32),
+        "coef4": coef4,
+    }
+    for key in ("idx2", "coef2", "idx4", "coef4"):
+        terms[key].flags.writeable = False
+    return terms
+
+
+def labs_term_counts(N: int) -> dict:
+    t = labs_hamiltonian_terms(N)
+    return {"two_body": len(t["idx2"]), "four_body": len(t["idx4"])}
+
+
+@lru_cache(maxsize=16)
+def labs_spin_operator(N: int):
+    """cudaq spin operator for the LABS Hamiltonian, built from the collected terms and cached per N."""
+    from cudaq import spin
+
+    t = labs_hamiltonian_terms(N)
+    hamiltonian = float(t["constant"])
+    for (a, b), c in zip(t["idx2"].tolist(), t["coef2"].tolist()):
+        hamiltonian += float(c) * spin.z(a) * spin.z(b)
+    for (a, b, c, d), w in zip(t["idx4"].tolist(), t["coef4"].tolist()):
+        hamiltonian += float(w) * spin.z(a) * spin.z(b) * spin.z(c) * spin.z(d)
+    return hamiltonian
+
+
+def diagonal_energies(bits01, chunk_terms: int = 1 << 22) -> np.ndarray:
+    """
+    <b|H|b> for computational-basis states, straight from the term arrays.
+    bits01: one bitstring or a (B, N) batch of 0/1 (qubit |1> -> Z = -1).
+    Rows are processed in chunks so B * n_terms stays under chunk_terms.
+    """
+    b = np.asarray(bits01, dtype=np.int8)
+    if b.ndim == 1:
+        b = b[None, :]
+    B, N = b.shape
+    t = labs_hamiltonian_terms(N)
+    z = (1 - 2 * b).astype(np.int8)
+
+    E = np.full(B, t["constant"], dtype=np.int64)
+    n_terms = max(1, len(t["idx2"]) + len(t["idx4"]))
+    step = max(1, chunk_terms // n_terms)
+    for a in range(0, B, step):
+        zc = z[a:a + step]
+        if len(t["idx2"]):
+            E[a:a + step] += np.prod(zc[:, t["idx2"]], axis=2, dtype=np.int8) @ t["coef2"]
+        if len(t["idx4"]):
+            E[a:a + step] += np.prod(zc[:, t["idx4"]], axis=2, dtype=np.int8) @ t["coef4"]
+    return E
+
+
+# -------------------------
+# Cached diagonal: E(b) for every basis state
+# -------------------------
+# H is diagonal in the Z basis, so <psi|H|psi> = |psi|^2 . diag and a sampled
+# shot's energy is diag[index]. E is invariant under reversal, so the same
+# vector serves both state-index bit orders (qubit 0 as most or least
+# significant bit). Max E = (N-1)N(2N-1)/6 fits uint16 up to N = 46.
+DIAGONAL_DTYPE = np.uint16
+
+
+def build_diagonal(N: int, chunk: int = 1 << 16) -> np.ndarray:
+    """(2^N,) energies, state index i read as a bit-packed word (labs_bitpack)."""
+    if not 1 <= N <= 46:
+        raise ValueError("build_diagonal supports 1 <= N <= 46")
+    total = 1 << N
+    diag = np.empty(total, dtype=DIAGONAL_DTYPE)
+    for a in range(0, total, chunk):
+        words = np.arange(a, min(total, a + chunk), dtype=np.uint64)[:, None]
+        diag[a:a + len(words)] = packed_energy(words, N)
+    return diag
+
+
+def _diagonal_path(N: int, cache_dir: str) -> str:
+    return os.path.join(cache_dir, f"labs_diagonal_N{N}.npy")
+
+
+def _load_diagonal(N: int, cache_dir: str, mmap: bool):
+    try:
+        diag = np.load(_diagonal_path(N, cache_dir), mmap_mode="r" if mmap else None)
+    except (OSError, ValueError):
+        return None
+    if diag.dtype != DIAGONAL_DTYPE or diag.shape != (1 << N,):
+        return None
+    return diag
+
+
+@lru_cache(maxsize=8)
+def diagonal_vector(N: int, cache_dir: str | None = DEFAULT_CACHE_DIR, mmap: bool = True) -> np.ndarray:
+    """
+    Read-only (2^N,) uint16 diagonal of H. Looked up in memory, then as .npy in
+    cache_dir (memory-mapped if mmap), then built and stored; None disables
+    the disk cache.
+    """
+    diag = None if cache_dir is None else _load_diagonal(N, cache_dir, mmap)
+    if diag is None:
+        diag = build_diagonal(N)
+        if cache_dir is not None:
+            saved = _atomic_save(_diagonal_path(N, cache_dir), np.save, diag)
+            if saved and mmap:
+                diag = _load_diagonal(N, cache_dir, mmap)
+    diag.flags.writeable = False
+    return diag
+
+
+def diagonal_expectation(psi, diag: np.ndarray | None = None) -> float:
+    """<psi|H|psi> for a (2^N,) statevector as one dot product."""
+    probs = np.abs(np.asarray(psi))**2
+    if diag is None:
+        diag = diagonal_vector(int(np.log2(probs.size)))
+    return float(probs @ diag)
+
+
+def counts_energies(counts, diag: np.ndarray | None = None):
+    """
+    Energies of sampled bitstrings by table lookup: (energies, shots) per
+    distinct key of a cudaq-style counts mapping.
+    """
+    keys = list(counts.keys())
+    shots = np.array([counts[k] for k in keys], dtype=np.int64)
+    if not keys:
+        return np.zeros(0, dtype=np.int64), shots
+    if diag is None:
+        diag = diagonal_vector(len(keys[0]))
+    idx = np.array([int(k, 2) for k in keys], dtype=np.int64)
+    return diag[idx].astype(np.int64), shots
@@ -0,0 +1,123 @@
+# labs_interactions.py
+# G2 / G4 interaction sets of the counterdiabatic LABS circuit (Eq. 15),
+# as contiguous int32 arrays. Same terms in the same order as the tutorial's
+# get_interactions triple loops, built with np.repeat instead. Results are
+# cached per N in memory and as .npz files on disk.
+import os
+from functools import lru_cache
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "LABS_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "labs_cache")
+)
+
+
+def interaction_counts(N: int) -> tuple[int, int]:
+    """Closed-form |G2|, |G4| (the tutorial's sanity-check sums)."""
+    i = np.arange(1, N - 1)
+    n2 = int(np.sum((N - i) // 2))
+    n4 = 0
+    for i in range(1, N - 2):
+        t = np.arange(1, (N - i - 1) // 2 + 1)
+        n4 += int(np.sum(N - i - 2 * t))
+    return n2, n4
+
+
+def _ragged_arange(counts: np.ndarray) -> np.ndarray:
+    """concatenate([arange(c) for c in counts]) without the Python loop."""
+    counts = np.asarray(counts, dtype=np.int64)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.arange(int(counts.sum()), dtype=np.int64) - starts
+
+
+def build_interactions(N: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    G2 rows [i, i+k]: i = 0..N-3, k = 1..floor((N-1-i)/2).
+    G4 rows [i, i+t, i+k, i+k+t]: i = 0..N-4, t = 1..floor((N-2-i)/2), k = t+1..N-1-i-t.
+    """
+    if not isinstance(N, (int, np.integer)) or N < 4:
+        raise ValueError("N must be an integer >= 4")
+
+    i0 = np.arange(N - 2)
+    n_k = (N - 1 - i0) // 2
+    i = np.repeat(i0, n_k)
+    k = _ragged_arange(n_k) + 1
+    G2 = np.stack([i, i + k], axis=1)
+
+    i0 = np.arange(N - 3)
+    n_t = (N - 2 - i0) // 2
+    i = np.repeat(i0, n_t)
+    t = _ragged_arange(n_t) + 1
+    n_k = N - 1 - i - 2 * t
+    i, t = np.repeat(i, n_k), np.repeat(t, n_k)
+    k = _ragged_arange(n_k) + t + 1
+    G4 = np.stack([i, i + t, i + k, i + k + t], axis=1)
+
+    return np.ascontiguousarray(G2, dtype=np.int32), np.ascontiguousarray(G4, dtype=np.int32)
+
+
+def _cache_path(N: int, cache_dir: str) -> str:
+    return os.path.join(cache_dir, f"interactions_N{N}.npz")
+
+
+def _load_cached(N: int, cache_dir: str):
+    try:
+        with np.load(_cache_path(N, cache_dir)) as f:
+            G2, G4 = f["G2"], f["G4"]
+    except (OSError, KeyError, ValueError):
+        return None
+    if (G2.dtype != np.int32 or G4.dtype != np.int32
+            or G2.shape[1:] != (2,) or G4.shape[1:] != (4,)
+            or (len(G2), len(G4)) != interaction_counts(N)):
+        return None
+    return G2, G4
+
+
+def _atomic_save(path: str, save, *args, **kwargs) -> bool:
+    """
+    save(tmp, *args, **kwargs) (np.save / np.savez) to a temp file next to
+    path, then rename it over path, so readers never see a partial file.
+    Returns False if the directory is not writable.
+    """
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp{os.path.splitext(path)[1]}"
+        save(tmp, *args, **kwargs)
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        return False  # a read-only checkout just skips the disk cache
+
+
+def _save_cached(N: int, cache_dir: str, G2: np.ndarray, G4: np.ndarray) -> None:
+    _atomic_save(_cache_path(N, cache_dir), np.savez, G2=G2, G4=G4)
+
+
+@lru_cache(maxsize=128)
+def get_interactions(N: int, cache_dir: str | None = DEFAULT_CACHE_DIR) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (G2, G4) as read-only (M, 2) / (M, 4) int32 arrays. Looked up in memory,
+    then in cache_dir (None disables the disk cache), then built and stored.
+    """
+    cached = None if cache_dir is None else _load_cached(N, cache_dir)
+    if cached is None:
+        cached = build_interactions(N)
+        if cache_dir is not None:
+            _save_cached(N, cache_dir, *cached)
+    G2, G4 = cached
+    G2.flags.writeable = False
+    G4.flags.writeable = False
+    return G2, G4
+
+
+@lru_cache(maxsize=32)
+def get_interaction_lists(N: int, cache_dir: str | None = DEFAULT_CACHE_DIR
+                          ) -> tuple[list[list[int]], list[list[int]]]:
+    """
+    Nested-list view for cudaq kernels typed list[list[int]] (e.g.
+    trotterized_circuit). Cached, so don't mutate the returned lists.
+    cache_dir is passed to get_interactions.
+    """
+    G2, G4 = get_interactions(N, cache_dir)
+    return G2.tolist(), G4.tolist()
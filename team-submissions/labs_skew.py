@@ -0,0 +1,79 @@
+# labs_skew.py
+# Skew-symmetric sequences for odd N = 2m + 1:
+#   s[m + l] = (-1)^l * s[m - l],  l = 1..m
+# so the n = m + 1 bits s[0..m] (the "free half") fix the sequence. All
+# odd-lag correlations vanish and E = sum over even k of C_k^2. Many odd-N
+# optima are skew-symmetric, so searching the free half halves the dimension.
+import numpy as np
+
+from labs_batch import as_pm1_matrix
+
+
+def skew_free_len(N: int) -> int:
+    if N < 1 or N % 2 == 0:
+        raise ValueError(f"skew-symmetric mode needs odd N, got N={N}")
+    return (N + 1) // 2
+
+
+def skew_expand(H) -> np.ndarray:
+    """(B, n) free halves -> (B, 2n-1) skew-symmetric ±1 sequences (1D in, 1D out)."""
+    H = np.asarray(H, dtype=np.int8)
+    single = H.ndim == 1
+    H = as_pm1_matrix(H)
+    n = H.shape[1]
+    m = n - 1
+    l = np.arange(1, n)
+    S = np.empty((H.shape[0], 2 * n - 1), dtype=np.int8)
+    S[:, :n] = H
+    S[:, m + l] = np.where(l % 2 == 0, 1, -1).astype(np.int8) * H[:, m - l]
+    return S[0] if single else S
+
+
+def skew_free_part(S) -> np.ndarray:
+    """Free half s[0..m] of each row (a projection for non-skew rows)."""
+    S = np.asarray(S)
+    return S[..., : (S.shape[-1] + 1) // 2].copy()
+
+
+def is_skew_symmetric(S) -> np.ndarray:
+    S = as_pm1_matrix(S)
+    if S.shape[1] % 2 == 0:
+        return np.zeros(S.shape[0], dtype=bool)
+    return np.all(skew_expand(skew_free_part(S)) == S, axis=1)
+
+
+def skew_mirror_index(N: int) -> np.ndarray:
+    """mirror[i] = position tied to free bit i (2m - i); the centre maps to itself."""
+    n = skew_free_len(N)
+    return 2 * (n - 1) - np.arange(n)
+
+
+def skew_energy_batch(H) -> np.ndarray:
+    """Energies of the expanded rows of H, from the even lags only."""
+    S = skew_expand(as_pm1_matrix(H)).astype(np.int32)
+    N = S.shape[1]
+    E = np.zeros(S.shape[0], dtype=np.int64)
+    for k in range(2, N, 2):
+        C = np.einsum("bi,bi->b", S[:, :-k], S[:, k:]).astype(np.int64)
+        E += C * C
+    return E
+
+
+def skew_optimum(N: int, chunk: int = 1 << 15) -> dict:
+    """
+    Exhaustive search of the 2^((N+1)/2) skew-symmetric sequences, in chunks.
+    Returns the best skew-symmetric energy and the free halves reaching it.
+    """
+    n = skew_free_len(N)
+    bit = np.arange(n, dtype=np.int64)
+    best_E, best_H = None, []
+    for a in range(0, 1 << n, chunk):
+        idx = np.arange(a, min(1 << n, a + chunk), dtype=np.int64)
+        H = (1 - 2 * ((idx[:, None] >> bit) & 1)).astype(np.int8)
+        E = skew_energy_batch(H)
+        e_min = int(E.min())
+        if best_E is None or e_min < best_E:
+            best_E, best_H = e_min, []
+        if e_min == best_E:
+            best_H.append(H[E == e_min])
+    return {"N": N, "best_E": best_E, "optimal_free": np.concatenate(best_H)}
@@ -0,0 +1,221 @@
+# mps_sim.py
+# Matrix-product-state simulator for mps_ansatz beyond statevector sizes
+# (the CPU stand-in for the tensornet target in gpu-update3.ipynb).
+# Gates come from a statevector_sim.Circuit; two-qubit gates must act on
+# neighbouring qubits (true for the mps_ansatz CNOT chain) and are applied by
+# SVD, keeping at most max_bond singular values (and dropping those below
+# cutoff * the largest). The discarded weight is summed in truncation_error.
+#
+# The LABS Hamiltonian is an exact MPO of bond dimension ~2N, because
+#   H = N(N-1)/2 + 2 sum Z_a Z_{a+2k} + 4 sum_{a<b<c<d, b-a = d-c} Z_a Z_b Z_c Z_d
+# (labs_hamiltonian) is generated left to right by a small automaton:
+#   idle -Z-> cnt[1] -I-> cnt[2] ... cnt[g] -2Z-> done         (g even: Z_a Z_{a+g})
+#   cnt[g] -Z-> hold[g] -I-> hold[g] -Z-> cd[g] -I-> ... cd[1] -4Z-> done
+# where cnt counts the gap b - a, hold waits for c, cd counts down to d = c + g.
+# Every operator is I or Z, so the MPO tensors are stored as (w, w, 2) diagonals.
+import numpy as np
+
+from statevector_sim import Circuit, mps_ansatz
+
+_SWAP = np.eye(4)[[0, 2, 1, 3]]
+
+
+# -------------------------
+# 1) LABS Hamiltonian as an MPO
+# -------------------------
+def labs_mpo(N: int) -> list[np.ndarray]:
+    """
+    W[i][m, n, s]: weight of the transition m -> n on site i with qubit i in
+    state s. States: idle = 0, cnt[g] = g, hold[g] = G + g, cd[r] = G + K + r,
+    done = w - 1. The first site starts in idle, the last ends in done.
+    """
+    G = N - 1                 # cnt[1..G]
+    K = max(0, (N - 2) // 2)  # hold / cd[1..K]: a gap g = b - a needs 2g + 1 <= N - 1
+    idle, done = 0, 1 + G + 2 * K
+    w = done + 1
+
+    I = np.array([1.0, 1.0])
+    Z = np.array([1.0, -1.0])
+    W = np.zeros((w, w, 2))
+    W[idle, idle] = I
+    W[done, done] = I
+    if G:
+        W[idle, 1] = Z
+    for g in range(1, G + 1):
+        if g < G:
+            W[g, g + 1] = I
+        if g % 2 == 0:
+            W[g, done] = 2 * Z
+        if g <= K:
+            W[g, G + g] = Z
+            W[G + g, G + g] = I
+            W[G + g, G + K + g] = Z
+    for r in range(2, K + 1):
+        W[G + K + r, G + K + r - 1] = I
+    if K:
+        W[G + K + 1, done] = 4 * Z
+
+    first = W.copy()
+    first[idle, done] += N * (N - 1) / 2 * I  # the constant
+    Ws = [first] + [W] * (N - 1)
+    Ws[0] = Ws[0][idle:idle + 1]
+    Ws[-1] = Ws[-1][:, done:done + 1]
+    return Ws
+
+
+# -------------------------
+# 2) MPS
+# -------------------------
+class MPS:
+    """
+    N site tensors A[i] of shape (D_left, 2, D_right), starting in |0...0>.
+    center is the orthogonality centre: sites left of it are left-canonical,
+    sites right of it right-canonical.
+    """
+
+    def __init__(self, N: int, max_bond: int = 64, cutoff: float = 1e-12):
+        self.N = N
+        self.max_bond = max_bond
+        self.cutoff = cutoff
+        zero = np.zeros((1, 2, 1), dtype=complex)
+        zero[0, 0, 0] = 1.0
+        self.tensors = [zero.copy() for _ in range(N)]
+        self.center = 0
+        self.truncation_error = 0.0
+
+    @property
+    def bond_dims(self) -> list[int]:
+        return [A.shape[2] for A in self.tensors[:-1]]
+
+    def move_center(self, j: int) -> None:
+        A = self.tensors
+        while self.center < j:
+            c = self.center
+            Dl, _, Dr = A[c].shape
+            Q, R = np.linalg.qr(A[c].reshape(Dl * 2, Dr))
+            A[c] = Q.reshape(Dl, 2, -1)
+            A[c + 1] = np.tensordot(R, A[c + 1], axes=1)
+            self.center += 1
+        while self.center > j:
+            c = self.center
+            Dl, _, Dr = A[c].shape
+            Q, R = np.linalg.qr(A[c].reshape(Dl, 2 * Dr).T)
+            A[c] = Q.T.reshape(-1, 2, Dr)
+            A[c - 1] = np.tensordot(A[c - 1], R.T, axes=1)
+            self.center -= 1
+
+    def apply_1q(self, U: np.ndarray, i: int) -> None:
+        self.tensors[i] = np.einsum("st,atb->asb", U, self.tensors[i])
+
+    def apply_2q(self, U: np.ndarray, i: int, j: int) -> None:
+        """U on qubits (i, j) with |i - j| == 1, then SVD truncation of the shared bond."""
+        if abs(i - j) != 1:
+            raise ValueError(f"MPS gates must act on neighbouring qubits, got ({i}, {j})")
+        if i > j:
+            U, i = _SWAP @ U @ _SWAP, j
+        self.move_center(i)
+        A, B = self.tensors[i], self.tensors[i + 1]
+        Dl, Dr = A.shape[0], B.shape[2]
+        theta = np.einsum("asb,btc->astc", A, B)
+        theta = np.einsum("stuv,auvc->astc", U.reshape(2, 2, 2, 2), theta)
+        u, S, vh = np.linalg.svd(theta.reshape(Dl * 2, 2 * Dr), full_matrices=False)
+
+        keep = int(np.count_nonzero(S > self.cutoff * S[0])) if S[0] > 0 else 1
+        keep = max(1, min(keep, self.max_bond))
+        total = float(np.sum(S**2))
+        self.truncation_error += float(np.sum(S[keep:]**2)) / total
+        S = S[:keep] / np.sqrt(np.sum(S[:keep]**2) / total)
+
+        self.tensors[i] = u[:, :keep].reshape(Dl, 2, keep)
+        self.tensors[i + 1] = (S[:, None] * vh[:keep]).reshape(keep, 2, Dr)
+        self.center = i + 1
+
+    def apply(self, circuit: Circuit) -> "MPS":
+        for qubits, U in circuit.ops:
+            if len(qubits) == 1:
+                self.apply_1q(U, qubits[0])
+            elif len(qubits) == 2:
+                self.apply_2q(U, *qubits)
+            else:
+                raise ValueError(f"MPS supports 1- and 2-qubit gates, got {len(qubits)}")
+        return self
+
+    def norm(self) -> float:
+        E = np.ones((1, 1), dtype=complex)
+        for A in self.tensors:
+            E = np.einsum("ab,asc,bsd->cd", E, A.conj(), A)
+        return float(np.sqrt(abs(E[0, 0])))
+
+    def expectation_mpo(self, Ws: list[np.ndarray]) -> float:
+        """
+        <psi|W|psi> / <psi|psi> for an MPO with diagonal (w, w, 2) site tensors.
+        Only the nonzero transitions of each W are contracted (O(w) of w^2).
+        """
+        L = np.ones((1, 1, 1), dtype=complex)  # (bra bond, mpo bond, ket bond)
+        for A, W in zip(self.tensors, Ws):
+            src, dst = np.nonzero(np.any(W != 0, axis=2))
+            if not src.size:
+                return 0.0
+            order = np.argsort(dst, kind="stable")
+            src, dst = src[order], dst[order]
+            starts = np.flatnonzero(np.r_[True, dst[1:] != dst[:-1]])
+
+            T = np.tensordot(L, A.conj(), axes=(0, 0))            # (m, ket, s, bra')
+            T = T[src] * W[src, dst][:, None, :, None]
+            U = np.zeros((W.shape[1],) + T.shape[1:], dtype=complex)
+            U[dst[starts]] = np.add.reduceat(T, starts, axis=0)
+            L = np.tensordot(U, A, axes=([1, 2], [0, 1])).transpose(1, 0, 2)
+        return float(L[0, 0, 0].real) / self.norm()**2
+
+    def labs_energy(self) -> float:
+        return self.expectation_mpo(labs_mpo(self.N))
+
+    def to_statevector(self) -> np.ndarray:
+        """Dense (2^N,) vector, qubit 0 most significant (as statevector_sim); small N only."""
+        psi = np.ones((1, 1), dtype=complex)
+        for A in self.tensors:
+            psi = np.tensordot(psi, A, axes=1).reshape(-1, A.shape[2])
+        return psi.reshape(-1)
+
+    def sample(self, shots_count: int = 1000, seed=None) -> np.ndarray:
+        """
+        (shots, N) 0/1 samples drawn site by site from the exact MPS
+        distribution (moves the centre to site 0 first).
+        """
+        self.move_center(0)
+        rng = np.random.default_rng(seed)
+        bits = np.empty((shots_count, self.N), dtype=np.int8)
+        V = np.ones((shots_count, 1), dtype=complex)
+        rows = np.arange(shots_count)
+        for i, A in enumerate(self.tensors):
+            M = np.einsum("xa,asb->xsb", V, A)
+            p = np.sum(np.abs(M)**2, axis=2)
+            p /= p.sum(axis=1, keepdims=True)
+            s = (rng.random(shots_count) < p[:, 1]).astype(np.int8)
+            bits[:, i] = s
+            V = M[rows, s] / np.sqrt(p[rows, s])[:, None]
+        return bits
+
+
+# -------------------------
+# 3) Entry points
+# -------------------------
+def simulate_mps(circuit: Circuit, max_bond: int = 64, cutoff: float = 1e-12) -> MPS:
+    return MPS(circuit.n_qubits, max_bond, cutoff).apply(circuit)
+
+
+def sample_counts(mps: MPS, shots_count: int = 1000, seed=None) -> dict:
+    """cudaq.sample-style counts {bitstring: shots}, qubit 0 first."""
+    bits = mps.sample(shots_count, seed)
+    rows, counts = np.unique(bits, axis=0, return_counts=True)
+    return {"".join(map(str, r.tolist())): int(c) for r, c in zip(rows, counts)}
+
+
+def sample_population_mps(N: int, layers: int, parameters, num_samples: int,
+                          max_bond: int = 64, seed=None) -> np.ndarray:
+    """
+    sample_qite_population on the MPS simulator: (num_samples, N) ±1 seeds
+    for mts_quant1(initial_pop=...), '0' -> +1 as in the notebooks.
+    """
+    mps = simulate_mps(mps_ansatz(N, layers, parameters), max_bond)
+    return (1 - 2 * mps.sample(num_samples, seed)).astype(np.int8)
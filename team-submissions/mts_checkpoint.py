@@ -0,0 +1,60 @@
+# mts_checkpoint.py
+# Checkpoint files for long MTS runs: one .npz holding the population, its
+# energies, the best solution, the trace, the iteration counter, the
+# PopulationIndex duplicate count and the Generator's bit-generator state
+# (as JSON, since PCG64 state is 128-bit).
+# Written to a temp file and renamed, so a job killed mid-write leaves the
+# previous checkpoint intact.
+import json
+import os
+
+import numpy as np
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path: str, *, it: int, pop, pop_E, best_s, best_E: int, trace,
+                    rng: np.random.Generator, elapsed_sec: float, config: dict,
+                    rejected: int = 0) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(
+        tmp,
+        version=np.int64(CHECKPOINT_VERSION),
+        it=np.int64(it),
+        pop=np.asarray(pop, dtype=np.int8),
+        pop_E=np.asarray(pop_E, dtype=np.int64),
+        best_s=np.asarray(best_s, dtype=np.int8),
+        best_E=np.int64(best_E),
+        trace=np.asarray(trace, dtype=np.int64),
+        elapsed_sec=np.float64(elapsed_sec),
+        rejected=np.int64(rejected),
+        rng_state=np.array(json.dumps(rng.bit_generator.state)),
+        config=np.array(json.dumps(config)),
+    )
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: str) -> dict:
+    with np.load(path, allow_pickle=False) as f:
+        version = int(f["version"])
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f"{path}: checkpoint version {version}, expected {CHECKPOINT_VERSION}")
+        return {
+            "it": int(f["it"]),
+            "pop": f["pop"].copy(),
+            "pop_E": f["pop_E"].copy(),
+            "best_s": f["best_s"].copy(),
+            "best_E": int(f["best_E"]),
+            "trace": f["trace"].tolist(),
+            "elapsed_sec": float(f["elapsed_sec"]),
+            "rejected": int(f["rejected"]) if "rejected" in f.files else 0,
+            "rng_state": json.loads(str(f["rng_state"])),
+            "config": json.loads(str(f["config"])),
+        }
+
+
+def restore_rng(state: dict) -> np.random.Generator:
+    """Generator with the saved bit generator (same class) and state."""
+    bit_gen = getattr(np.random, state["bit_generator"])()
+    bit_gen.state = state
+    return np.random.Generator(bit_gen)
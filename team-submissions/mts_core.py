@@ -0,0 +1,645 @@
+# mts_core.py
+# Classical MTS engine shared by cpu.ipynb / gpu-update*.ipynb.
+# Same objective, operators and tabu rules as the notebooks, but the tabu search
+# keeps a persistent table of all N single-flip energy deltas.
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from labs_batch import labs_energy_batch
+from labs_store import resolve_target_E
+from labs_skew import skew_expand, skew_free_len, skew_free_part, skew_mirror_index
+from mts_checkpoint import save_checkpoint, load_checkpoint, restore_rng
+from mts_population import PopulationIndex
+
+# 1) LABS objective for ±1 sequences
+
+def pm1_to_bits01(s_pm1: np.ndarray) -> np.ndarray:
+    return ((s_pm1 + 1) // 2).astype(np.int8)
+
+def bits01_to_pm1(bits01) -> np.ndarray:
+    x = np.array(bits01, dtype=np.int8)
+    return (2*x - 1).astype(np.int8)  # 0->-1, 1->+1
+
+def labs_correlations_pm1(s: np.ndarray) -> np.ndarray:
+    """C[k-1] = C_k for k=1..N-1, C_k = sum_i s[i]*s[i+k]."""
+    N = s.size
+    C = np.empty(N-1, dtype=np.int32)
+    for k in range(1, N):
+        C[k-1] = int(np.dot(s[:-k], s[k:]))
+    return C
+
+def labs_energy_from_C(C: np.ndarray) -> int:
+    C64 = C.astype(np.int64)
+    return int(np.sum(C64*C64))
+
+def labs_energy_pm1(s: np.ndarray) -> int:
+    return labs_energy_from_C(labs_correlations_pm1(s))
+
+
+# 2) Algorithm 3: Combine & Mutate
+
+def combine_alg3(p1: np.ndarray, p2: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    N = p1.size
+    k = int(rng.integers(1, N))  # k in {1,...,N-1}
+    child = np.empty_like(p1)
+    child[:k] = p1[:k]
+    child[k:] = p2[k:]
+    return child
+
+def mutate_alg3(s: np.ndarray, p_mut: float, rng: np.random.Generator) -> np.ndarray:
+    out = s.copy()
+    if p_mut <= 0.0:
+        return out
+    mask = rng.random(out.size) < p_mut
+    out[mask] *= -1
+    return out
+
+
+# 3) Flip-delta table ("tau table")
+#    Flipping s[j] changes C_k by -2*s[j]*A[j,k] with A[j,k] = s[j+k] + s[j-k]
+#    (out-of-range neighbours count as 0), so
+#        dE[j] = 4 * (sum_k A[j,k]^2 - s[j] * (A @ C)[j]).
+#    A and Q = sum_k A^2 change in only N-1 entries per accepted flip; dE for
+#    every j is then one matrix-vector product instead of N Python loops.
+
+@lru_cache(maxsize=None)
+def _neighbour_index(N: int):
+    """Indices into s padded with N-1 zeros on each side: (j+k, j-k) for all j, k."""
+    j = np.arange(N)[:, None]
+    k = np.arange(1, N)[None, :]
+    off = N - 1
+    return (j + k + off), (j - k + off)
+
+def init_flip_table(s: np.ndarray):
+    """Build the neighbour-sum table A (N, N-1) and its row norms Q for sequence s."""
+    N = s.size
+    ip, im = _neighbour_index(N)
+    sp = np.zeros(3*N - 2, dtype=np.int32)
+    sp[N-1:2*N-1] = s
+    A = sp[ip] + sp[im]
+    Q = np.sum(A*A, axis=1, dtype=np.int64)
+    return A, Q
+
+def flip_deltas_pm1(s: np.ndarray, C: np.ndarray, A: np.ndarray, Q: np.ndarray) -> np.ndarray:
+    """Energy change of flipping each bit: E(s with s[j] flipped) - E(s), for all j."""
+    AC = A.astype(np.int64) @ C.astype(np.int64)
+    return 4 * (Q - s.astype(np.int64) * AC)
+
+def apply_flip_pm1(s: np.ndarray, C: np.ndarray, A: np.ndarray, Q: np.ndarray, j: int):
+    """Flip s[j] and update C, A, Q in place."""
+    N = s.size
+    sj = int(s[j])
+    C -= (2 * sj) * A[j]
+    # every other row i sees s[j] at lag |i-j|
+    rows = np.concatenate([np.arange(j), np.arange(j+1, N)])
+    cols = np.abs(rows - j) - 1
+    old = A[rows, cols].astype(np.int64)
+    A[rows, cols] -= 2 * sj
+    Q[rows] += (old - 2*sj)**2 - old*old
+    s[j] = -sj
+
+
+# 4) Tabu Search (single-bit flip neighborhood)
+#    - aspiration: allow tabu move if it improves best found in this tabu run
+#    - candidate_size: evaluate subset of flips each step (CPU-friendly)
+
+def delta_energy_single_flip_pm1(s: np.ndarray, C: np.ndarray, E: int, j: int):
+    """
+    After flipping s[j], update correlations deltaC and energy E_new.
+    Flip affects C_k terms that involve index j:
+      (j, j+k) and (j-k, j) when in bounds.
+    Each affected product changes sign => delta contribution = -2*old_term.
+    """
+    N = s.size
+    sj = int(s[j])
+    deltaC = np.zeros_like(C, dtype=np.int32)
+
+    for k in range(1, N):
+        d = 0
+        jp = j + k
+        jm = j - k
+        if jp < N:
+            d += sj * int(s[jp])
+        if jm >= 0:
+            d += int(s[jm]) * sj
+        if d != 0:
+            deltaC[k-1] = -2 * d
+
+    C64 = C.astype(np.int64)
+    d64 = deltaC.astype(np.int64)
+    dE = int(np.sum(2*C64*d64 + d64*d64))
+    return E + dE, deltaC
+
+def tabu_search_pm1(
+    s0: np.ndarray,
+    max_iters: int = 1000,
+    tabu_tenure: int = 30,
+    candidate_size: int = 64,
+    rng: np.random.Generator | None = None,
+    target_E: int | None = None,
+    should_stop=None,
+    stats=None,
+):
+    """
+    Tabu search driven by the flip-delta table: each step is one argmin over
+    the candidate deltas. Consumes the RNG exactly like tabu_search_pm1_reference,
+    so both return the same (best_s, best_E) for the same generator state.
+    Optional early exits: best_E <= target_E, or should_stop() returning True
+    (polled every 16 iterations, e.g. a flag shared between worker processes).
+    stats: optional mts_stats.MTSStats; adds iteration / move / aspiration
+    counts and the time spent updating the delta table.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    n_iters = n_aspiration = n_all_tabu = n_improving = 0
+    t_delta = 0.0
+
+    s = s0.copy()
+    C = labs_correlations_pm1(s)
+    E = labs_energy_from_C(C)
+    A, Q = init_flip_table(s)
+    dE = flip_deltas_pm1(s, C, A, Q)
+
+    best_s = s.copy()
+    best_E = int(E)
+
+    N = s.size
+    tabu_until = np.zeros(N, dtype=np.int32)
+    all_idx = np.arange(N)
+
+    for it in range(1, max_iters + 1):
+        # choose candidate flip indices
+        if candidate_size >= N:
+            candidates = all_idx
+        else:
+            candidates = rng.choice(N, size=candidate_size, replace=False)
+
+        # pick best admissible (tabu allowed only if aspiration);
+        # argmin keeps the first minimum, matching the scalar loop's tie-break
+        E_cand = E + dE[candidates]
+        admissible = (tabu_until[candidates] <= it) | (E_cand < best_E)
+        if admissible.any():
+            pos = np.flatnonzero(admissible)
+            chosen_j = int(candidates[pos[np.argmin(E_cand[pos])]])
+            if stats is not None and tabu_until[chosen_j] > it:
+                n_aspiration += 1
+        else:
+            # if all were blocked, ignore tabu
+            chosen_j = int(candidates[np.argmin(E_cand)])
+            n_all_tabu += 1
+
+        # apply flip
+        E = int(E + dE[chosen_j])
+        if stats is None:
+            apply_flip_pm1(s, C, A, Q, chosen_j)
+            dE = flip_deltas_pm1(s, C, A, Q)
+        else:
+            n_iters = it
+            t = time.perf_counter()
+            apply_flip_pm1(s, C, A, Q, chosen_j)
+            dE = flip_deltas_pm1(s, C, A, Q)
+            t_delta += time.perf_counter() - t
+
+        # update tabu tenure (with slight randomness)
+        tenure = tabu_tenure + int(rng.integers(0, max(1, tabu_tenure // 3)))
+        tabu_until[chosen_j] = it + tenure
+
+        if E < best_E:
+            best_E = int(E)
+            best_s = s.copy()
+            n_improving += 1
+            if target_E is not None and best_E <= target_E:
+                break
+
+        if should_stop is not None and it % 16 == 0 and should_stop():
+            break
+
+    if stats is not None:
+        stats.count("tabu_runs")
+        stats.count("tabu_iters", n_iters)
+        stats.count("moves_evaluated", n_iters * min(candidate_size, N))
+        stats.count("aspiration_moves", n_aspiration)
+        stats.count("all_tabu_moves", n_all_tabu)
+        stats.count("improving_moves", n_improving)
+        stats.add_time("delta", t_delta)
+    return best_s, best_E
+
+def tabu_search_pm1_reference(
+    s0: np.ndarray,
+    max_iters: int = 1000,
+    tabu_tenure: int = 30,
+    candidate_size: int = 64,
+    rng: np.random.Generator | None = None,
+):
+    """Original per-candidate tabu search from the notebooks, kept for validation."""
+    if rng is None:
+        rng = np.random.default_rng()
+
+    s = s0.copy()
+    C = labs_correlations_pm1(s)
+    E = labs_energy_from_C(C)
+
+    best_s = s.copy()
+    best_E = int(E)
+
+    N = s.size
+    tabu_until = np.zeros(N, dtype=np.int32)
+
+    for it in range(1, max_iters + 1):
+        # choose candidate flip indices
+        if candidate_size >= N:
+            candidates = np.arange(N)
+        else:
+            candidates = rng.choice(N, size=candidate_size, replace=False)
+
+        chosen_j = None
+        chosen_E = None
+        chosen_dC = None
+
+        # pick best admissible (tabu allowed only if aspiration)
+        for j in candidates:
+            E_new, dC = delta_energy_single_flip_pm1(s, C, E, int(j))
+            is_tabu = tabu_until[j] > it
+            if is_tabu and (E_new >= best_E):
+                continue
+            if (chosen_E is None) or (E_new < chosen_E):
+                chosen_j, chosen_E, chosen_dC = int(j), int(E_new), dC
+
+        # if all were blocked, ignore tabu
+        if chosen_j is None:
+            for j in candidates:
+                E_new, dC = delta_energy_single_flip_pm1(s, C, E, int(j))
+                if (chosen_E is None) or (E_new < chosen_E):
+                    chosen_j, chosen_E, chosen_dC = int(j), int(E_new), dC
+
+        # apply flip
+        s[chosen_j] *= -1
+        C += chosen_dC
+        E = chosen_E
+
+        # update tabu tenure (with slight randomness)
+        tenure = tabu_tenure + int(rng.integers(0, max(1, tabu_tenure // 3)))
+        tabu_until[chosen_j] = it + tenure
+
+        if E < best_E:
+            best_E = int(E)
+            best_s = s.copy()
+
+    return best_s, best_E
+
+
+# 4b) Skew-symmetric tabu search (odd N): a move flips free bit i together
+#     with its mirror 2m - i, which keeps the sequence skew-symmetric. For a
+#     pair p < q both single-flip updates count the product s_p s_q at lag
+#     q - p, which does not change, hence the +4 s_p s_q correction:
+#         dC = -2 s_p A[p] - 2 s_q A[q] + 4 s_p s_q e_{q-p}
+
+def skew_move_deltas(s: np.ndarray, C: np.ndarray, A: np.ndarray, moves: np.ndarray,
+                     mirror: np.ndarray | None = None) -> np.ndarray:
+    """Energy change of each paired move i in moves (free-bit indices)."""
+    if mirror is None:
+        mirror = skew_mirror_index(s.size)
+    p = moves
+    q = mirror[moves]
+    sp = s[p].astype(np.int64)
+    # the centre bit (p == q) has no partner: zero its second term; its
+    # correction lands on column -1 with weight 0
+    sq = s[q].astype(np.int64) * (q != p)
+    dC = -2 * (sp[:, None] * A[p] + sq[:, None] * A[q])
+    dC[np.arange(p.size), q - p - 1] += 4 * sp * sq
+    return np.sum(dC * (2 * C.astype(np.int64) + dC), axis=1)
+
+def tabu_search_skew(
+    s0: np.ndarray,
+    max_iters: int = 1000,
+    tabu_tenure: int = 30,
+    candidate_size: int = 64,
+    rng: np.random.Generator | None = None,
+    target_E: int | None = None,
+    should_stop=None,
+    stats=None,
+):
+    """
+    tabu_search_pm1 restricted to skew-symmetric sequences: s0 must be
+    skew-symmetric (odd N) and the neighbourhood is the (N+1)/2 paired moves.
+    Same aspiration / tenure / early-exit rules and stats counters; the
+    "delta" time covers the move deltas and the paired flip-table updates.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    n_iters = n_aspiration = n_all_tabu = n_improving = 0
+    t_delta = 0.0
+
+    s = s0.copy()
+    N = s.size
+    n = skew_free_len(N)
+    mirror = skew_mirror_index(N)
+    C = labs_correlations_pm1(s)
+    E = labs_energy_from_C(C)
+    A, Q = init_flip_table(s)
+
+    best_s = s.copy()
+    best_E = int(E)
+    tabu_until = np.zeros(n, dtype=np.int32)
+    all_moves = np.arange(n)
+
+    for it in range(1, max_iters + 1):
+        n_iters = it
+        if candidate_size >= n:
+            candidates = all_moves
+        else:
+            candidates = rng.choice(n, size=candidate_size, replace=False)
+
+        if stats is not None:
+            t = time.perf_counter()
+        E_cand = E + skew_move_deltas(s, C, A, candidates, mirror)
+        if stats is not None:
+            t_delta += time.perf_counter() - t
+        admissible = (tabu_until[candidates] <= it) | (E_cand < best_E)
+        if admissible.any():
+            pos = np.flatnonzero(admissible)
+            k = pos[np.argmin(E_cand[pos])]
+            if stats is not None and tabu_until[candidates[k]] > it:
+                n_aspiration += 1
+        else:
+            k = int(np.argmin(E_cand))
+            n_all_tabu += 1
+        i = int(candidates[k])
+
+        E = int(E_cand[k])
+        if stats is not None:
+            t = time.perf_counter()
+        apply_flip_pm1(s, C, A, Q, i)
+        if mirror[i] != i:
+            apply_flip_pm1(s, C, A, Q, int(mirror[i]))
+        if stats is not None:
+            t_delta += time.perf_counter() - t
+
+        tenure = tabu_tenure + int(rng.integers(0, max(1, tabu_tenure // 3)))
+        tabu_until[i] = it + tenure
+
+        if E < best_E:
+            best_E = int(E)
+            best_s = s.copy()
+            n_improving += 1
+            if target_E is not None and best_E <= target_E:
+                break
+
+        if should_stop is not None and it % 16 == 0 and should_stop():
+            break
+
+    if stats is not None:
+        stats.count("tabu_runs")
+        stats.count("tabu_iters", n_iters)
+        stats.count("moves_evaluated", n_iters * min(candidate_size, n))
+        stats.count("aspiration_moves", n_aspiration)
+        stats.count("all_tabu_moves", n_all_tabu)
+        stats.count("improving_moves", n_improving)
+        stats.add_time("delta", t_delta)
+    return best_s, best_E
+
+
+# 5) Memetic Tabu Search, optionally seeded with a quantum population
+
+def init_population(N: int, pop_size: int, initial_pop: np.ndarray | None,
+                    rng: np.random.Generator, verbose: bool = False):
+    """
+    Start from initial_pop (e.g. quantum samples) when given, pad with random
+    sequences up to pop_size, and score everything in one batched pass.
+    verbose prints which kind of population was used.
+    """
+    ## check if have pop or not
+    if initial_pop is not None:
+        if verbose:
+            print(f"Using Quantum-enhanced population (size: {len(initial_pop)})")
+        pop = np.array(initial_pop, dtype=np.int8)
+    else:
+        if verbose:
+            print("Using Randomly generated population.")
+        pop = rng.choice(np.array([-1, 1], dtype=np.int8), size=(pop_size, N))
+
+    if pop.shape[0] < pop_size:
+        extra_count = pop_size - pop.shape[0]
+        extra = rng.choice(np.array([-1, 1], dtype=np.int8), size=(extra_count, N))
+        pop = np.vstack([pop, extra])
+    pop = pop[:pop_size]
+
+    pop_E = labs_energy_batch(pop).astype(np.int64)
+    return pop, pop_E
+
+def make_child(pop: np.ndarray, pop_size: int, p_combine: float, p_mut: float,
+               rng: np.random.Generator, select=None) -> np.ndarray:
+    """
+    Combine two random parents (prob. p_combine) or copy one, then mutate.
+    select() -> slot replaces the uniform parent draw (e.g. a tournament).
+    """
+    if rng.random() < p_combine:
+        if select is None:
+            i1, i2 = rng.integers(0, pop_size, size=2)
+        else:
+            i1, i2 = select(), select()
+        child = combine_alg3(pop[i1], pop[i2], rng)
+    else:
+        i = int(rng.integers(0, pop_size)) if select is None else select()
+        child = pop[i].copy()
+    return mutate_alg3(child, p_mut, rng)
+
+def make_skew_child(pop: np.ndarray, pop_size: int, p_combine: float, p_mut: float,
+                    rng: np.random.Generator, select=None) -> np.ndarray:
+    """make_child on the free halves of skew-symmetric parents, expanded back to length N."""
+    n = (pop.shape[1] + 1) // 2
+    return skew_expand(make_child(pop[:, :n], pop_size, p_combine, p_mut, rng, select))
+
+def insert_result(pop: np.ndarray, pop_E: np.ndarray, best_s: np.ndarray, best_E: int,
+                  result_s: np.ndarray, result_E: int, rng: np.random.Generator):
+    """
+    Update the best solution, replace a random member if the result beats it,
+    and keep the best in the population (elitism). pop / pop_E change in place.
+    Returns the new (best_s, best_E).
+    """
+    if result_E < best_E:
+        best_E = int(result_E)
+        best_s = result_s.copy()
+
+    # randomly replace a member if result is better
+    r = int(rng.integers(0, pop_E.size))
+    if result_E < pop_E[r]:
+        pop[r] = result_s
+        pop_E[r] = result_E
+
+    # elitism: keep global best in population
+    worst = int(np.argmax(pop_E))
+    if best_E < pop_E[worst]:
+        pop[worst] = best_s
+        pop_E[worst] = best_E
+    return best_s, best_E
+
+def _lap(stats, phase: str, t0: float) -> float:
+    t = time.perf_counter()
+    stats.add_time(phase, t - t0)
+    return t
+
+def mts_quant1(
+    N: int,
+    pop_size: int = 32,
+    initial_pop: np.ndarray = None, # for quantum algo output
+    p_combine: float = 0.7,
+    p_mut: float = 1.0/50.0,
+    mts_iters: int = 1000,
+    tabu_iters: int = 800,
+    tabu_tenure: int = 30,
+    candidate_size: int = 64,
+    target_E: int | str | None = None, # "known": best-known E from labs_store
+    seed: int = 0,
+    verbose_every: int = 100,
+    stats=None, # optional mts_stats.MTSStats: phase timers, tabu counters, diversity
+    tabu_engine: str = "python", # "jit": mts_jit.tabu_search_jit (numba, same results)
+    checkpoint_path: str | None = None, # save state here every checkpoint_every runs and at the end
+    checkpoint_every: int = 0,
+    resume_from: str | None = None, # continue a checkpointed run (see resume_mts_quant1)
+    skew: bool = False, # odd N only: search skew-symmetric sequences (labs_skew)
+    replace_policy: str = "random", # "worst": replace the worst member (mts_population)
+    dedupe: bool = False, # reject results equivalent to a member under flip / reversal
+    tournament_size: int = 0, # > 0: tournament parent selection instead of uniform
+):
+    target_E = resolve_target_E(N, target_E)
+    new_child = make_child
+    if skew:
+        skew_free_len(N)  # odd N check
+        if tabu_engine != "python":
+            raise ValueError("skew mode uses tabu_search_skew; tabu_engine must be 'python'")
+        tabu_search, new_child = tabu_search_skew, make_skew_child
+    elif tabu_engine == "jit":
+        from mts_jit import tabu_search_jit as tabu_search
+    elif tabu_engine == "python":
+        tabu_search = tabu_search_pm1
+    else:
+        raise ValueError(f"unknown tabu_engine {tabu_engine!r}, expected 'python' or 'jit'")
+    config = {
+        "N": N, "pop_size": pop_size, "p_combine": p_combine, "p_mut": p_mut,
+        "mts_iters": mts_iters, "tabu_iters": tabu_iters, "tabu_tenure": tabu_tenure,
+        "candidate_size": candidate_size, "target_E": target_E, "seed": seed,
+        "verbose_every": verbose_every, "tabu_engine": tabu_engine,
+        "checkpoint_every": checkpoint_every, "skew": skew,
+        "replace_policy": replace_policy, "dedupe": dedupe, "tournament_size": tournament_size,
+    }
+
+    if resume_from is not None:
+        ck = load_checkpoint(resume_from)
+        if ck["pop"].shape != (pop_size, N):
+            raise ValueError(f"{resume_from}: population {ck['pop'].shape} does not match "
+                             f"pop_size={pop_size}, N={N}")
+        rng = restore_rng(ck["rng_state"])
+        pop, pop_E = ck["pop"], ck["pop_E"]
+        best_s, best_E, trace = ck["best_s"], ck["best_E"], ck["trace"]
+        start_it, elapsed0 = ck["it"] + 1, ck["elapsed_sec"]
+        rejected0 = ck["rejected"]
+    else:
+        rng = np.random.default_rng(seed)
+        pop, pop_E = init_population(N, pop_size, initial_pop, rng, verbose_every > 0)
+        if skew:
+            # keep each member's free half (quantum samples are rarely skew-symmetric)
+            pop = skew_expand(skew_free_part(pop))
+            pop_E = labs_energy_batch(pop).astype(np.int64)
+        best_idx = int(np.argmin(pop_E))
+        best_s = pop[best_idx].copy()
+        best_E = int(pop_E[best_idx])
+        trace = [best_E]
+        start_it, elapsed0 = 1, 0.0
+        rejected0 = 0
+    if stats is not None and stats.diversity_every:
+        stats.record_diversity(start_it - 1, pop)
+
+    # the plain path (uniform parents, random replacement) needs no index
+    index, select = None, None
+    if replace_policy != "random" or dedupe or tournament_size:
+        index = PopulationIndex(pop, pop_E, dedupe=dedupe, replace=replace_policy)
+        index.rejected = rejected0
+        if tournament_size:
+            select = lambda: index.tournament(rng, tournament_size)
+
+    t0 = time.time() - elapsed0
+    last_it = start_it - 1
+
+    def checkpoint():
+        save_checkpoint(checkpoint_path, it=last_it, pop=pop, pop_E=pop_E, best_s=best_s,
+                        best_E=best_E, trace=trace, rng=rng,
+                        elapsed_sec=time.time() - t0, config=config,
+                        rejected=0 if index is None else index.rejected)
+
+    for it in range(start_it, mts_iters + 1):
+        if target_E is not None and best_E <= target_E:
+            break
+
+        if stats is not None:
+            t_phase = time.perf_counter()
+
+        # ---- Make and Mutate Child ----
+        child = new_child(pop, pop_size, p_combine, p_mut, rng, select)
+        if stats is not None:
+            t_phase = _lap(stats, "child", t_phase)
+
+        # ---- Tabu Search with Child ----
+        result_s, result_E = tabu_search(
+            child,
+            max_iters=tabu_iters,
+            tabu_tenure=tabu_tenure,
+            candidate_size=candidate_size,
+            rng=rng,
+            stats=stats,
+        )
+        if stats is not None:
+            tabu_sec = time.perf_counter() - t_phase
+            t_phase = _lap(stats, "tabu", t_phase)
+            E_sum = int(pop_E.sum())
+
+        # ---- Update best solution and Population ----
+        if index is None:
+            best_s, best_E = insert_result(pop, pop_E, best_s, best_E, result_s, result_E, rng)
+        else:
+            best_s, best_E = index.insert(best_s, best_E, result_s, result_E, rng)
+
+        trace.append(best_E)
+
+        if stats is not None:
+            _lap(stats, "insert", t_phase)
+            replaced = int(pop_E.sum()) != E_sum
+            stats.count("replacements", int(replaced))
+            stats.record_run(it, result_E, best_E, tabu_sec, replaced)
+            if stats.diversity_every and it % stats.diversity_every == 0:
+                stats.record_diversity(it, pop)
+
+        if verbose_every and (it % verbose_every == 0):
+            print(f"[MTS {it:5d}] best_E={best_E}  elapsed={time.time()-t0:.2f}s")
+
+        last_it = it
+        if checkpoint_path and checkpoint_every and it % checkpoint_every == 0:
+            checkpoint()
+
+    if checkpoint_path:
+        checkpoint()
+
+    return {
+        "best_s_pm1": best_s,
+        "best_s_01": pm1_to_bits01(best_s),
+        "best_E": best_E,
+        "best_trace": np.array(trace, dtype=np.int64),
+        "population_pm1": pop,
+        "population_E": pop_E.copy(),
+        "elapsed_sec": time.time() - t0,
+        "duplicates_rejected": 0 if index is None else index.rejected,
+    }
+
+def resume_mts_quant1(checkpoint_path: str, **overrides):
+    """
+    Continue the run saved in checkpoint_path with its original settings
+    (overrides may change e.g. mts_iters or verbose_every) and keep
+    checkpointing to the same file. An uninterrupted run with the same
+    settings gives identical results.
+    """
+    config = load_checkpoint(checkpoint_path)["config"]
+    config.update(overrides)
+    config.setdefault("checkpoint_path", checkpoint_path)
+    return mts_quant1(**config, resume_from=checkpoint_path)
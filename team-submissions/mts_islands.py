@@ -0,0 +1,192 @@
+# mts_islands.py
+# Island-model Memetic Tabu Search: several sub-populations run the mts_quant1
+# loop independently and swap their best members every migration_interval
+# tabu runs. Only the migrants cross island boundaries, so islands can live in
+# separate processes with very little communication.
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from labs_store import resolve_target_E
+from mts_core import init_population, make_child, insert_result, tabu_search_pm1, pm1_to_bits01
+
+TOPOLOGIES = ("ring", "full")
+
+
+def migration_targets(n_islands: int, topology: str) -> list[list[int]]:
+    """targets[i] = islands that receive island i's migrants."""
+    if topology == "ring":
+        return [[(i + 1) % n_islands] for i in range(n_islands)] if n_islands > 1 else [[]]
+    if topology == "full":
+        return [[j for j in range(n_islands) if j != i] for i in range(n_islands)]
+    raise ValueError(f"unknown topology {topology!r}, expected one of {TOPOLOGIES}")
+
+
+def _new_island(N, pop_size, initial_pop, seed_seq):
+    rng = np.random.default_rng(seed_seq)
+    pop, pop_E = init_population(N, pop_size, initial_pop, rng)
+    best_idx = int(np.argmin(pop_E))
+    return {
+        "pop": pop,
+        "pop_E": pop_E,
+        "best_s": pop[best_idx].copy(),
+        "best_E": int(pop_E[best_idx]),
+        "rng": rng,
+        "trace": [int(pop_E[best_idx])],
+        "tabu_runs": 0,
+        "hit_run": None,
+    }
+
+
+def _island_epoch(island, n_iters, p_combine, p_mut, tabu_iters, tabu_tenure,
+                  candidate_size, target_E):
+    """Run n_iters steady-state MTS iterations on one island; returns the island."""
+    pop, pop_E, rng = island["pop"], island["pop_E"], island["rng"]
+    best_s, best_E = island["best_s"], island["best_E"]
+    pop_size = pop_E.size
+
+    for _ in range(n_iters):
+        if target_E is not None and best_E <= target_E:
+            break
+        child = make_child(pop, pop_size, p_combine, p_mut, rng)
+        result_s, result_E = tabu_search_pm1(
+            child,
+            max_iters=tabu_iters,
+            tabu_tenure=tabu_tenure,
+            candidate_size=candidate_size,
+            rng=rng,
+            target_E=target_E,
+        )
+        best_s, best_E = insert_result(pop, pop_E, best_s, best_E, result_s, result_E, rng)
+        island["tabu_runs"] += 1
+        island["trace"].append(best_E)
+        if target_E is not None and best_E <= target_E and island["hit_run"] is None:
+            island["hit_run"] = island["tabu_runs"]
+
+    island["best_s"], island["best_E"] = best_s, best_E
+    return island
+
+
+def _migrate(islands, targets, n_migrants):
+    """
+    Synchronous migration: every island's top n_migrants (chosen before any
+    island is modified) replace the receiver's worst members when they are
+    better and not already present. Returns the number of accepted migrants
+    per (src, dst) pair.
+    """
+    outgoing = []
+    for isl in islands:
+        top = np.argsort(isl["pop_E"], kind="stable")[:n_migrants]
+        outgoing.append([(isl["pop"][i].copy(), int(isl["pop_E"][i])) for i in top])
+
+    accepted = {}
+    for src, dsts in enumerate(targets):
+        for dst in dsts:
+            isl = islands[dst]
+            n_ok = 0
+            for s, E in outgoing[src]:
+                if np.any(np.all(isl["pop"] == s, axis=1)):
+                    continue
+                worst = int(np.argmax(isl["pop_E"]))
+                if E < isl["pop_E"][worst]:
+                    isl["pop"][worst] = s
+                    isl["pop_E"][worst] = E
+                    n_ok += 1
+                    if E < isl["best_E"]:
+                        isl["best_E"], isl["best_s"] = E, s.copy()
+            accepted[(src, dst)] = n_ok
+    return accepted
+
+
+def mts_islands(
+    N: int,
+    n_islands: int = 4,
+    island_pop_size: int = 32,
+    initial_pop: np.ndarray = None, # for quantum algo output, dealt round-robin
+    p_combine: float = 0.7,
+    p_mut: float = 1.0/50.0,
+    mts_iters: int = 1000,
+    tabu_iters: int = 800,
+    tabu_tenure: int = 30,
+    candidate_size: int = 64,
+    migration_interval: int = 50,
+    n_migrants: int = 1,
+    topology: str = "ring",
+    target_E: int | str | None = None, # "known": best-known E from labs_store
+    seed: int = 0,
+    n_workers: int = 1,
+    verbose_every: int = 0,
+):
+    """
+    Island-model MTS. mts_iters is the tabu-run budget per island; islands
+    exchange migrants after every migration_interval runs. With n_workers > 1
+    each epoch's islands are evaluated on a process pool; results are
+    identical to n_workers=1 because each island carries its own Generator.
+
+    Returns the usual mts_quant1 keys for the global best, plus per-island
+    traces (best-so-far after each tabu run), the tabu run at which each
+    island first reached target_E, and a log of accepted migrants.
+    """
+    target_E = resolve_target_E(N, target_E)
+    targets = migration_targets(n_islands, topology)
+    seeds = np.random.SeedSequence(seed).spawn(n_islands)
+    islands = []
+    for i in range(n_islands):
+        init_i = None if initial_pop is None else initial_pop[i::n_islands]
+        islands.append(_new_island(N, island_pop_size, init_i, seeds[i]))
+
+    pool = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else None
+    t0 = time.time()
+    time_to_target = None
+    migration_log = []
+    global_trace = [min(isl["best_E"] for isl in islands)]
+    epoch = 0
+    try:
+        while islands[0]["tabu_runs"] < mts_iters:
+            n_iters = min(migration_interval, mts_iters - islands[0]["tabu_runs"])
+            args = (p_combine, p_mut, tabu_iters, tabu_tenure, candidate_size, target_E)
+            if pool is None:
+                islands = [_island_epoch(isl, n_iters, *args) for isl in islands]
+            else:
+                futures = [pool.submit(_island_epoch, isl, n_iters, *args) for isl in islands]
+                islands = [f.result() for f in futures]
+            epoch += 1
+
+            best_E = min(isl["best_E"] for isl in islands)
+            global_trace.append(best_E)
+            if verbose_every and epoch % verbose_every == 0:
+                per_island = " ".join(str(isl["best_E"]) for isl in islands)
+                print(f"[Islands epoch {epoch:4d}] best_E={best_E}  islands=[{per_island}]  "
+                      f"elapsed={time.time()-t0:.2f}s")
+
+            if target_E is not None and best_E <= target_E:
+                time_to_target = time.time() - t0
+                break
+
+            if n_islands > 1 and n_migrants > 0:
+                for (src, dst), n_ok in _migrate(islands, targets, n_migrants).items():
+                    if n_ok:
+                        migration_log.append((epoch, src, dst, n_ok))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    best_island = int(np.argmin([isl["best_E"] for isl in islands]))
+    best_s = islands[best_island]["best_s"]
+    return {
+        "best_s_pm1": best_s,
+        "best_s_01": pm1_to_bits01(best_s),
+        "best_E": int(islands[best_island]["best_E"]),
+        "best_trace": np.array(global_trace, dtype=np.int64),
+        "population_pm1": np.vstack([isl["pop"] for isl in islands]),
+        "population_E": np.concatenate([isl["pop_E"] for isl in islands]),
+        "elapsed_sec": time.time() - t0,
+        "best_island": best_island,
+        "island_traces": [np.array(isl["trace"], dtype=np.int64) for isl in islands],
+        "island_best_E": [int(isl["best_E"]) for isl in islands],
+        "island_hit_run": [isl["hit_run"] for isl in islands],
+        "time_to_target_sec": time_to_target,
+        "migrations": migration_log,
+        "epochs": epoch,
+    }
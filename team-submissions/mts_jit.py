@@ -0,0 +1,202 @@
+# mts_jit.py
+# Optional Numba engine for the MTS hot path: energy evaluation, the flip-delta
+# table and the tabu move loop compiled as one kernel. Without numba,
+# tabu_search_jit falls back to mts_core.tabu_search_pm1.
+#
+# Bit-identical to tabu_search_pm1 for the same Generator state: the kernel
+# cannot call numpy's Generator, so the candidate sets and tenure jitters are
+# drawn up front in exactly the order the Python loop draws them. If the run
+# stops early (target_E), the generator is rewound and advanced by only the
+# draws actually used, so callers see the same RNG state afterwards too.
+#
+# combine_alg3 / mutate_alg3 stay in mts_core: they are a slice copy and one
+# vectorized mask, with no per-element interpreter loop to remove.
+import numpy as np
+
+from mts_core import tabu_search_pm1
+
+try:
+    import numba
+except ImportError:  # optional dependency
+    numba = None
+
+HAVE_NUMBA = numba is not None
+
+
+# -------------------------
+# Kernels (plain Python that numba compiles unchanged)
+# -------------------------
+def _energy_kernel(s):
+    N = s.shape[0]
+    E = 0
+    for k in range(1, N):
+        c = 0
+        for i in range(N - k):
+            c += s[i] * s[i + k]
+        E += c * c
+    return E
+
+
+def _tabu_kernel(s0, max_iters, tabu_tenure, cand, jitter, target_E, has_target):
+    """
+    Same moves as mts_core.tabu_search_pm1. cand: (max_iters, M) candidate
+    indices per iteration, or (0, 0) for "all N in order"; jitter: tenure
+    offsets per iteration. Returns (best_s, best_E, iterations run).
+    """
+    N = s0.shape[0]
+    s = np.empty(N, dtype=np.int64)
+    for i in range(N):
+        s[i] = s0[i]
+
+    # correlations, energy, neighbour-sum table A[j, k-1] = s[j+k] + s[j-k], Q = row norms
+    C = np.zeros(N - 1, dtype=np.int64)
+    for k in range(1, N):
+        for i in range(N - k):
+            C[k - 1] += s[i] * s[i + k]
+    E = 0
+    for k in range(N - 1):
+        E += C[k] * C[k]
+    A = np.zeros((N, N - 1), dtype=np.int64)
+    Q = np.zeros(N, dtype=np.int64)
+    for j in range(N):
+        for k in range(1, N):
+            a = 0
+            if j + k < N:
+                a += s[j + k]
+            if j - k >= 0:
+                a += s[j - k]
+            A[j, k - 1] = a
+            Q[j] += a * a
+    dE = np.empty(N, dtype=np.int64)
+    for j in range(N):
+        ac = 0
+        for k in range(N - 1):
+            ac += A[j, k] * C[k]
+        dE[j] = 4 * (Q[j] - s[j] * ac)
+
+    best_s = s.copy()
+    best_E = E
+    tabu_until = np.zeros(N, dtype=np.int64)
+    use_all = cand.shape[0] == 0
+    M = N if use_all else cand.shape[1]
+    n_run = 0
+
+    for it in range(1, max_iters + 1):
+        n_run = it
+        # best admissible candidate (tabu allowed only if aspiration), first minimum wins
+        chosen = -1
+        chosen_E = 0
+        for m in range(M):
+            j = m if use_all else cand[it - 1, m]
+            e = E + dE[j]
+            if (tabu_until[j] <= it or e < best_E) and (chosen < 0 or e < chosen_E):
+                chosen, chosen_E = j, e
+        if chosen < 0:
+            # all blocked: ignore tabu
+            for m in range(M):
+                j = m if use_all else cand[it - 1, m]
+                e = E + dE[j]
+                if chosen < 0 or e < chosen_E:
+                    chosen, chosen_E = j, e
+
+        # apply flip: C, A, Q in O(N), then all deltas
+        E = chosen_E
+        sj = s[chosen]
+        for k in range(N - 1):
+            C[k] -= 2 * sj * A[chosen, k]
+        for i in range(N):
+            if i != chosen:
+                col = abs(i - chosen) - 1
+                old = A[i, col]
+                new = old - 2 * sj
+                A[i, col] = new
+                Q[i] += new * new - old * old
+        s[chosen] = -sj
+        for j in range(N):
+            ac = 0
+            for k in range(N - 1):
+                ac += A[j, k] * C[k]
+            dE[j] = 4 * (Q[j] - s[j] * ac)
+
+        tabu_until[chosen] = it + tabu_tenure + jitter[it - 1]
+
+        if E < best_E:
+            best_E = E
+            for i in range(N):
+                best_s[i] = s[i]
+            if has_target and best_E <= target_E:
+                break
+
+    return best_s, best_E, n_run
+
+
+if HAVE_NUMBA:
+    _energy_jit = numba.njit(cache=True)(_energy_kernel)
+    _tabu_jit = numba.njit(cache=True)(_tabu_kernel)
+
+
+# -------------------------
+# Public entry points
+# -------------------------
+def labs_energy_jit(s: np.ndarray) -> int:
+    s = np.asarray(s, dtype=np.int64)
+    return int(_energy_jit(s) if HAVE_NUMBA else _energy_kernel(s))
+
+
+def _draw_moves(rng, N, n_iters, candidate_size, tabu_tenure):
+    """The Generator calls tabu_search_pm1 makes over n_iters iterations, in its order."""
+    jitter_hi = max(1, tabu_tenure // 3)
+    jitter = np.empty(n_iters, dtype=np.int64)
+    if candidate_size >= N:
+        cand = np.zeros((0, 0), dtype=np.int64)
+        for it in range(n_iters):
+            jitter[it] = rng.integers(0, jitter_hi)
+    else:
+        cand = np.empty((n_iters, candidate_size), dtype=np.int64)
+        for it in range(n_iters):
+            cand[it] = rng.choice(N, size=candidate_size, replace=False)
+            jitter[it] = rng.integers(0, jitter_hi)
+    return cand, jitter
+
+
+def tabu_search_jit(
+    s0: np.ndarray,
+    max_iters: int = 1000,
+    tabu_tenure: int = 30,
+    candidate_size: int = 64,
+    rng: np.random.Generator | None = None,
+    target_E: int | None = None,
+    should_stop=None,
+    stats=None,
+    engine: str = "auto",
+):
+    """
+    Drop-in for tabu_search_pm1. engine: "jit" (needs numba), "python" (the
+    same kernel uncompiled, for validation), or "auto" (jit if numba is
+    installed, else tabu_search_pm1). should_stop / stats use tabu_search_pm1.
+    """
+    if engine == "auto":
+        engine = "jit" if HAVE_NUMBA else "fallback"
+    if engine == "jit" and not HAVE_NUMBA:
+        raise ImportError("engine='jit' requires numba")
+    if engine not in ("jit", "python", "fallback"):
+        raise ValueError(f"unknown engine {engine!r}, expected 'auto', 'jit' or 'python'")
+    if engine == "fallback" or should_stop is not None or stats is not None:
+        return tabu_search_pm1(s0, max_iters, tabu_tenure, candidate_size, rng,
+                               target_E=target_E, should_stop=should_stop, stats=stats)
+    if rng is None:
+        rng = np.random.default_rng()
+
+    N = s0.size
+    state = rng.bit_generator.state
+    cand, jitter = _draw_moves(rng, N, max_iters, candidate_size, tabu_tenure)
+    kernel = _tabu_jit if engine == "jit" else _tabu_kernel
+    best_s, best_E, n_run = kernel(
+        np.asarray(s0, dtype=np.int64), max_iters, tabu_tenure, cand, jitter,
+        0 if target_E is None else int(target_E), target_E is not None,
+    )
+    if n_run < max_iters:
+        # stopped early: leave the generator where the Python loop would have
+        rng.bit_generator.state = state
+        _draw_moves(rng, N, n_run, candidate_size, tabu_tenure)
+    return best_s.astype(s0.dtype), int(best_E)
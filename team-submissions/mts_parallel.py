@@ -0,0 +1,174 @@
+# mts_parallel.py
+# Process-pool Memetic Tabu Search: many tabu searches run concurrently, one
+# child per task. Children are generated and merged back in rounds by the
+# driver, so for a fixed (seed, batch_size) the result does not depend on
+# n_workers or on which worker finishes first.
+import os
+import time
+from contextlib import nullcontext
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from labs_store import resolve_target_E
+from mts_core import (
+    init_population, make_child, insert_result, tabu_search_pm1, pm1_to_bits01,
+)
+
+NO_HIT = np.iinfo(np.int64).max
+
+# set in each worker by _init_worker; lowest task index that reached target_E
+_hit_index = None
+
+
+class _LocalHit:
+    """Stand-in for the shared mp.Value when running in-process (n_workers=1)."""
+    def __init__(self):
+        self.value = NO_HIT
+
+    def get_lock(self):
+        return nullcontext()
+
+
+def _init_worker(hit_index):
+    global _hit_index
+    _hit_index = hit_index
+
+
+def _tabu_task(task_idx, child, seed_seq, tabu_iters, tabu_tenure, candidate_size, target_E):
+    """
+    One tabu search on its own Generator stream. Stops early if an
+    earlier-indexed task already reached target_E, so the first hit in
+    submission order is always the one reported.
+    """
+    rng = np.random.default_rng(seed_seq)
+    result_s, result_E = tabu_search_pm1(
+        child,
+        max_iters=tabu_iters,
+        tabu_tenure=tabu_tenure,
+        candidate_size=candidate_size,
+        rng=rng,
+        target_E=target_E,
+        should_stop=lambda: _hit_index.value < task_idx,
+    )
+    if target_E is not None and result_E <= target_E:
+        with _hit_index.get_lock():
+            if task_idx < _hit_index.value:
+                _hit_index.value = task_idx
+    return task_idx, result_s, result_E
+
+
+def mts_parallel(
+    N: int,
+    pop_size: int = 32,
+    initial_pop: np.ndarray = None, # for quantum algo output
+    p_combine: float = 0.7,
+    p_mut: float = 1.0/50.0,
+    mts_iters: int = 1000,
+    tabu_iters: int = 800,
+    tabu_tenure: int = 30,
+    candidate_size: int = 64,
+    target_E: int | str | None = None, # "known": best-known E from labs_store
+    seed: int = 0,
+    n_workers: int | None = None,
+    batch_size: int | None = None,
+    verbose_every: int = 100,
+):
+    """
+    Parallel counterpart of mts_quant1.
+
+    Each round the driver makes batch_size children (default: n_workers * 4)
+    from the current population with the master RNG, gives each child its own
+    SeedSequence-spawned Generator, runs the tabu searches on the pool and then
+    merges results in submission order with the same replace/elitism rules as
+    mts_quant1. mts_iters counts tabu runs, as in the serial loop.
+
+    When target_E is given, workers share the lowest task index that reached
+    it; every later task stops at its next poll, the round is cut at that
+    index and the run ends.
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    if batch_size is None:
+        batch_size = n_workers * 4
+
+    target_E = resolve_target_E(N, target_E)
+    rng = np.random.default_rng(seed)
+    seed_root = np.random.SeedSequence(seed)
+
+    pop, pop_E = init_population(N, pop_size, initial_pop, rng, verbose_every > 0)
+
+    best_idx = int(np.argmin(pop_E))
+    best_s = pop[best_idx].copy()
+    best_E = int(pop_E[best_idx])
+
+    trace = [best_E]
+    t0 = time.time()
+
+    if n_workers > 1:
+        hit_index = mp.Value("q", NO_HIT)
+        pool = ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker, initargs=(hit_index,)
+        )
+    else:
+        hit_index = _LocalHit()
+        _init_worker(hit_index)
+        pool = None
+
+    done = 0
+    rounds = 0
+    try:
+        while done < mts_iters:
+            if target_E is not None and best_E <= target_E:
+                break
+
+            # ---- Make Children (master RNG only, in submission order) ----
+            n_tasks = min(batch_size, mts_iters - done)
+            seeds = seed_root.spawn(n_tasks)
+            tasks = []
+            for t in range(n_tasks):
+                child = make_child(pop, pop_size, p_combine, p_mut, rng)
+                tasks.append((done + t, child, seeds[t], tabu_iters, tabu_tenure,
+                              candidate_size, target_E))
+
+            # ---- Tabu Search on all children ----
+            if pool is None:
+                results = [_tabu_task(*task) for task in tasks]
+            else:
+                futures = [pool.submit(_tabu_task, *task) for task in tasks]
+                results = [f.result() for f in futures]
+
+            # ---- Merge in submission order, cut at the first target hit ----
+            hit = hit_index.value
+            for task_idx, result_s, result_E in results:
+                if task_idx > hit:
+                    break
+
+                best_s, best_E = insert_result(pop, pop_E, best_s, best_E,
+                                               result_s, result_E, rng)
+                trace.append(best_E)
+                done += 1
+
+                if verbose_every and (done % verbose_every == 0):
+                    print(f"[MTS-par {done:5d}] best_E={best_E}  elapsed={time.time()-t0:.2f}s")
+
+            rounds += 1
+            if hit != NO_HIT:
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    return {
+        "best_s_pm1": best_s,
+        "best_s_01": pm1_to_bits01(best_s),
+        "best_E": best_E,
+        "best_trace": np.array(trace, dtype=np.int64),
+        "population_pm1": pop,
+        "population_E": pop_E.copy(),
+        "elapsed_sec": time.time() - t0,
+        "n_workers": n_workers,
+        "rounds": rounds,
+        "tabu_runs": done,
+    }
@@ -0,0 +1,117 @@
+# mts_population.py
+# Indexed MTS population. Keeps, next to the (P, N) pop / pop_E arrays it
+# updates in place:
+#   - a count of canonical keys, so a result equivalent to a member under
+#     global flip / reversal (symValidator.dihedral_orbit) is found in O(1);
+#   - lazy min / max heaps over pop_E, so best / worst slot are O(log P)
+#     instead of an argmin / argmax over the population.
+# Heap entries are (E, slot, stamp); an entry is stale once its slot has been
+# replaced (stamp changed) and is dropped when it reaches the top. Ties go to
+# the lowest slot, as with np.argmin / np.argmax.
+import heapq
+from collections import Counter
+
+import numpy as np
+
+REPLACE_POLICIES = ("random", "worst")
+
+
+def canonical_key(s: np.ndarray) -> bytes:
+    """
+    Bit-packed key shared by s, -s, s[::-1] and -s[::-1]: fixing the first
+    spin removes the global flip, so only the two reading directions remain.
+    """
+    s = np.asarray(s)
+    return min(np.packbits(s != s[0]).tobytes(), np.packbits(s[::-1] != s[-1]).tobytes())
+
+
+class PopulationIndex:
+    """
+    Canonical-key counts and best / worst heaps for a population. replace()
+    is the only way slots should change while the index is in use.
+    """
+
+    def __init__(self, pop: np.ndarray, pop_E: np.ndarray, dedupe: bool = True,
+                 replace: str = "random"):
+        if replace not in REPLACE_POLICIES:
+            raise ValueError(f"unknown replace policy {replace!r}, expected one of {REPLACE_POLICIES}")
+        self.pop, self.pop_E = pop, pop_E
+        self.dedupe = dedupe
+        self.policy = replace
+        self.keys = [canonical_key(s) for s in pop]
+        self.key_count = Counter(self.keys)
+        self.rejected = 0
+        self._rebuild()
+
+    def _rebuild(self):
+        P = self.pop_E.size
+        self._stamp = np.zeros(P, dtype=np.int64)
+        self._min = [(int(e), i, 0) for i, e in enumerate(self.pop_E)]
+        self._max = [(-int(e), i, 0) for i, e in enumerate(self.pop_E)]
+        heapq.heapify(self._min)
+        heapq.heapify(self._max)
+
+    def _top(self, heap) -> int:
+        while heap[0][2] != self._stamp[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0][1]
+
+    def best_slot(self) -> int:
+        return self._top(self._min)
+
+    def worst_slot(self) -> int:
+        return self._top(self._max)
+
+    def __contains__(self, s) -> bool:
+        return self.key_count[canonical_key(s)] > 0
+
+    def replace(self, i: int, s: np.ndarray, E: int, key: bytes | None = None) -> None:
+        key = canonical_key(s) if key is None else key
+        old = self.keys[i]
+        self.key_count[old] -= 1
+        if not self.key_count[old]:
+            del self.key_count[old]
+        self.keys[i] = key
+        self.key_count[key] += 1
+        self.pop[i] = s
+        self.pop_E[i] = E
+
+        self._stamp[i] += 1
+        stamp = int(self._stamp[i])
+        heapq.heappush(self._min, (int(E), i, stamp))
+        heapq.heappush(self._max, (-int(E), i, stamp))
+        if len(self._min) > 4 * self.pop_E.size + 64:
+            self._rebuild()
+
+    def tournament(self, rng: np.random.Generator, k: int) -> int:
+        """Slot of the lowest-energy member among k drawn uniformly (with replacement)."""
+        idx = rng.integers(0, self.pop_E.size, size=k)
+        return int(idx[np.argmin(self.pop_E[idx])])
+
+    def insert(self, best_s: np.ndarray, best_E: int, result_s: np.ndarray, result_E: int,
+               rng: np.random.Generator):
+        """
+        mts_core.insert_result on the index: "random" replaces a random member
+        the result beats, "worst" the worst member. With dedupe, a result whose
+        canonical key is already present is not inserted, and elitism only
+        copies the best in when it is missing. Returns the new (best_s, best_E).
+        """
+        if result_E < best_E:
+            best_E = int(result_E)
+            best_s = result_s.copy()
+
+        r = int(rng.integers(0, self.pop_E.size)) if self.policy == "random" else self.worst_slot()
+        if result_E < self.pop_E[r]:
+            key = canonical_key(result_s)
+            if self.dedupe and self.key_count[key]:
+                self.rejected += 1
+            else:
+                self.replace(r, result_s, result_E, key)
+
+        # elitism: keep global best in population
+        worst = self.worst_slot()
+        if best_E < self.pop_E[worst]:
+            key = canonical_key(best_s)
+            if not (self.dedupe and self.key_count[key]):
+                self.replace(worst, best_s, best_E, key)
+        return best_s, best_E
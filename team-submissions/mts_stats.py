@@ -0,0 +1,89 @@
+# mts_stats.py
+# Optional counters / timers for mts_quant1 and tabu_search_pm1 / tabu_search_skew.
+# Pass stats=MTSStats() to any of them; with stats=None (the default) the
+# hot loops only pay for an "is not None" test. Timers use perf_counter and
+# are only read when stats are enabled.
+import json
+import time
+
+import numpy as np
+
+
+def population_diversity(pop: np.ndarray) -> dict:
+    """
+    Mean pairwise Hamming distance / N of a ±1 population (O(B*N) via column
+    counts) and the fraction of distinct rows.
+    """
+    B, N = pop.shape
+    if B < 2 or N == 0:
+        return {"mean_hamming": 0.0, "unique_frac": 1.0 if B else 0.0}
+    plus = np.count_nonzero(pop > 0, axis=0).astype(np.int64)
+    pair_dist = int(np.sum(plus * (B - plus)))
+    return {
+        "mean_hamming": pair_dist / (B * (B - 1) / 2 * N),
+        "unique_frac": len(np.unique(pop, axis=0)) / B,
+    }
+
+
+class MTSStats:
+    """
+    Accumulates counters, per-phase wall time, a diversity timeline and one
+    record per tabu run. report() gives the derived rates as a dict;
+    write_trace() dumps everything as JSON.
+    """
+
+    def __init__(self, diversity_every: int = 0, keep_runs: bool = True):
+        self.diversity_every = diversity_every
+        self.keep_runs = keep_runs
+        self.counters = {
+            "tabu_runs": 0,
+            "tabu_iters": 0,
+            "moves_evaluated": 0,
+            "aspiration_moves": 0,
+            "all_tabu_moves": 0,
+            "improving_moves": 0,
+            "replacements": 0,
+        }
+        self.timers = {"child": 0.0, "tabu": 0.0, "delta": 0.0, "insert": 0.0}
+        self.diversity = []
+        self.runs = []
+        self.t_start = time.perf_counter()
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_time(self, phase: str, dt: float):
+        self.timers[phase] = self.timers.get(phase, 0.0) + dt
+
+    def record_diversity(self, it: int, pop: np.ndarray):
+        self.diversity.append({"it": it, **population_diversity(pop)})
+
+    def record_run(self, it: int, result_E: int, best_E: int, tabu_sec: float, replaced: bool):
+        if self.keep_runs:
+            self.runs.append({"it": it, "result_E": int(result_E), "best_E": int(best_E),
+                              "tabu_sec": tabu_sec, "replaced": replaced})
+
+    def report(self) -> dict:
+        c, t = self.counters, self.timers
+        wall = time.perf_counter() - self.t_start
+        iters = max(1, c["tabu_iters"])
+        timed = sum(v for k, v in t.items() if k != "delta")  # delta is part of tabu
+        return {
+            "counters": dict(c),
+            "timers_sec": dict(t),
+            "wall_sec": wall,
+            "moves_per_sec": c["moves_evaluated"] / t["tabu"] if t["tabu"] > 0 else None,
+            "tabu_iters_per_sec": c["tabu_iters"] / t["tabu"] if t["tabu"] > 0 else None,
+            "aspiration_rate": c["aspiration_moves"] / iters,
+            "all_tabu_rate": c["all_tabu_moves"] / iters,
+            "improving_rate": c["improving_moves"] / iters,
+            "replacement_rate": c["replacements"] / c["tabu_runs"] if c["tabu_runs"] else None,
+            "phase_frac": {k: v / timed for k, v in t.items()} if timed > 0 else {},
+            "diversity": list(self.diversity),
+        }
+
+    def write_trace(self, path: str) -> dict:
+        doc = {**self.report(), "runs": self.runs}
+        with open(path, "w") as f:
+            json.dump(doc, f, indent=1)
+        return doc
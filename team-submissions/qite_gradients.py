@@ -0,0 +1,204 @@
+# qite_gradients.py
+# Gradient engine for the VarQITE loop in cpu.ipynb / gpu-update3.ipynb.
+# All shifted parameter sets of one step go to the simulator as a single
+# batch (a broadcast cudaq.observe call, or observe_async over the available
+# QPUs) instead of 2P sequential observe calls. The energy at the current point
+# rides along in the same batch. SPSA is the cheap mode: 2 evaluations per
+# sample, whatever the number of parameters.
+#
+# The estimators only need energy_batch(param_sets (B, P)) -> (B,) energies,
+# so they work the same with any backend.
+import numpy as np
+
+OBSERVE_MODES = ("broadcast", "async", "serial", "diagonal", "local")
+
+
+# -------------------------
+# 1) Batched energy evaluation
+# -------------------------
+def observe_batch(kernel, hamiltonian, N, layers, param_sets, mode="broadcast"):
+    """
+    <H> of kernel(N, layers, params) for every row of param_sets.
+    mode="diagonal" takes the cudaq statevector and dots |psi|^2 with the
+    cached diagonal (hamiltonian = labs_hamiltonian.diagonal_vector(N)).
+    mode="local" runs statevector_sim instead of cudaq: kernel is then a
+    circuit builder (e.g. statevector_sim.mps_ansatz) and hamiltonian the
+    diagonal or a labs_hamiltonian_terms dict.
+    """
+    param_sets = np.atleast_2d(np.asarray(param_sets, dtype=float))
+    B = len(param_sets)
+    rows = param_sets.tolist()
+    if mode == "local":
+        from statevector_sim import observe
+        return np.array([observe(kernel(N, layers, p), hamiltonian) for p in rows], dtype=float)
+
+    import cudaq
+    if mode == "broadcast":
+        results = cudaq.observe(kernel, hamiltonian, [N] * B, [layers] * B, rows)
+        return np.array([r.expectation() for r in results], dtype=float)
+    if mode == "async":
+        n_qpus = max(1, cudaq.get_target().num_qpus())
+        futures = [
+            cudaq.observe_async(kernel, hamiltonian, N, layers, p, qpu_id=b % n_qpus)
+            for b, p in enumerate(rows)
+        ]
+        return np.array([f.get().expectation() for f in futures], dtype=float)
+    if mode == "diagonal":
+        from labs_hamiltonian import diagonal_expectation
+        return np.array(
+            [diagonal_expectation(np.asarray(cudaq.get_state(kernel, N, layers, p)), hamiltonian)
+             for p in rows],
+            dtype=float,
+        )
+    if mode == "serial":
+        return np.array(
+            [cudaq.observe(kernel, hamiltonian, N, layers, p).expectation() for p in rows],
+            dtype=float,
+        )
+    raise ValueError(f"unknown observe mode {mode!r}, expected one of {OBSERVE_MODES}")
+
+
+def make_energy_batch(kernel, hamiltonian, N, layers, mode="broadcast"):
+    """energy_batch(param_sets) bound to one kernel and one (reused) Hamiltonian."""
+    def energy_batch(param_sets):
+        return observe_batch(kernel, hamiltonian, N, layers, param_sets, mode)
+    return energy_batch
+
+
+# -------------------------
+# 2) Gradient estimators
+# -------------------------
+def shifted_parameters(params, shift=np.pi / 2):
+    """(2P, P): rows 0..P-1 are theta + shift*e_i, rows P..2P-1 are theta - shift*e_i."""
+    params = np.asarray(params, dtype=float)
+    eye = shift * np.eye(params.size)
+    return np.vstack([params + eye, params - eye])
+
+
+def parameter_shift_gradients(energy_batch, params, shift=np.pi / 2, with_energy=False):
+    """
+    dE/dtheta_i = 0.5 * (E(theta_i + pi/2) - E(theta_i - pi/2)), all 2P
+    energies in one batch. with_energy=True also returns E(theta) from the same batch.
+    """
+    params = np.asarray(params, dtype=float)
+    P = params.size
+    sets = shifted_parameters(params, shift)
+    if with_energy:
+        sets = np.vstack([params, sets])
+    E = energy_batch(sets)
+    grads = 0.5 * (E[-2 * P:-P] - E[-P:]) if P else np.zeros(0)
+    return (float(E[0]), grads) if with_energy else grads
+
+
+def parameter_shift_gradients_serial(energy_fn, params, shift=np.pi / 2):
+    """Reference: the notebook's one-observe-at-a-time loop. energy_fn(list) -> float."""
+    params = np.asarray(params, dtype=float)
+    n = len(params)
+    grads = np.zeros(n)
+    for i in range(n):
+        p_plus = params.copy()
+        p_minus = params.copy()
+        p_plus[i] += shift
+        p_minus[i] -= shift
+        grads[i] = 0.5 * (energy_fn(p_plus.tolist()) - energy_fn(p_minus.tolist()))
+    return grads
+
+
+def spsa_gradients(energy_batch, params, rng, c=0.1, n_samples=1, with_energy=False):
+    """
+    SPSA estimate averaged over n_samples random ±1 directions Delta:
+      g = (E(theta + c*Delta) - E(theta - c*Delta)) / (2c) * Delta
+    Costs 2 * n_samples energies, in one batch.
+    """
+    params = np.asarray(params, dtype=float)
+    delta = rng.choice(np.array([-1.0, 1.0]), size=(n_samples, params.size))
+    sets = np.vstack([params + c * delta, params - c * delta])
+    if with_energy:
+        sets = np.vstack([params, sets])
+    E = energy_batch(sets)
+    E_plus, E_minus = E[-2 * n_samples:-n_samples], E[-n_samples:]
+    grads = (((E_plus - E_minus) / (2.0 * c))[:, None] * delta).mean(axis=0)
+    return (float(E[0]), grads) if with_energy else grads
+
+
+GRADIENTS = {
+    "shift": parameter_shift_gradients,
+    "spsa": spsa_gradients,
+}
+
+
+# -------------------------
+# 3) VarQITE (S ≈ I) on top of the engine
+# -------------------------
+def run_varqite(
+    kernel,
+    N,
+    layers,
+    steps=20,
+    dtau=0.05,
+    gradient="shift",
+    observe_mode="broadcast",
+    hamiltonian=None,
+    energy_batch=None,
+    seed=None,
+    spsa_c=0.1,
+    spsa_samples=1,
+    verbose=True,
+):
+    """
+    run_real_varqite with the batched gradient engine: theta <- theta - dtau * 0.5 * dE.
+    Each step costs one batch (energy + gradient at the new point). The
+    Hamiltonian defaults to the cached labs_spin_operator(N) (the cached
+    diagonal for observe_mode "diagonal" / "local"); energy_batch overrides
+    the backend altogether.
+    Returns (params, energies).
+    """
+    if gradient not in GRADIENTS:
+        raise ValueError(f"unknown gradient {gradient!r}, expected one of {tuple(GRADIENTS)}")
+    rng = np.random.default_rng(seed)
+    if energy_batch is None:
+        if hamiltonian is None and observe_mode in ("diagonal", "local"):
+            from labs_hamiltonian import diagonal_vector
+            hamiltonian = diagonal_vector(N)
+        elif hamiltonian is None:
+            from labs_hamiltonian import labs_spin_operator
+            hamiltonian = labs_spin_operator(N)
+        energy_batch = make_energy_batch(kernel, hamiltonian, N, layers, observe_mode)
+
+    def energy_and_grad(p):
+        if gradient == "spsa":
+            return spsa_gradients(energy_batch, p, rng, c=spsa_c, n_samples=spsa_samples,
+                                  with_energy=True)
+        return parameter_shift_gradients(energy_batch, p, with_energy=True)
+
+    num_params = (layers + 1) * N
+    params = rng.uniform(-np.pi, np.pi, num_params)
+    if verbose:
+        print(f"[VarQITE] N={N}, layers={layers}, steps={steps}, gradient={gradient}, "
+              f"observe={observe_mode}")
+
+    E, dE = energy_and_grad(params)
+    energies = [E]
+    if verbose:
+        print(f" step 0: Energy = {E:.10f}")
+
+    for step in range(1, steps + 1):
+        # McLachlan update with S ≈ I: theta_dot = -C = -0.5 * dE
+        params = params + dtau * (-0.5 * dE)
+        params = (params + np.pi) % (2 * np.pi) - np.pi
+
+        grad_norm = np.linalg.norm(dE)
+        if step < steps:
+            E, dE = energy_and_grad(params)
+        else:
+            E = float(energy_batch(params[None, :])[0])
+        energies.append(E)
+        if verbose:
+            print(f" step {step:3d}: Energy = {E:.10f}, ||dE|| = {grad_norm:.4e}")
+
+        if abs(energies[-1] - energies[-2]) < 1e-9:
+            if verbose:
+                print(" Converged.")
+            break
+
+    return params.tolist(), energies
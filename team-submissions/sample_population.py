@@ -0,0 +1,100 @@
+# sample_population.py
+# Quantum sample counts -> MTS population, in bulk.
+# Bitstrings are joined into one ASCII buffer and viewed as a (U, N) uint8
+# matrix instead of being parsed character by character; repeated shots are
+# expanded with np.repeat instead of row-by-row copies.
+# CUDA-Q convention as in the notebooks: '0' -> |0> -> +1, '1' -> |1> -> -1.
+import numpy as np
+
+from labs_batch import labs_energy_batch
+
+
+def counts_to_arrays(counts):
+    """Distinct sampled bitstrings as a (U, N) int8 ±1 matrix plus their shot counts."""
+    items = list(counts.items())
+    if not items:
+        return np.zeros((0, 0), dtype=np.int8), np.zeros(0, dtype=np.int64)
+    keys = [k for k, _ in items]
+    N = len(keys[0])
+    raw = np.frombuffer("".join(keys).encode("ascii"), dtype=np.uint8).reshape(len(keys), N)
+    S = (1 - 2 * (raw - ord("0"))).astype(np.int8)
+    shots = np.array([c for _, c in items], dtype=np.int64)
+    return S, shots
+
+
+def _lex_less(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Row-wise A < B in lexicographic order."""
+    diff = A != B
+    first = np.argmax(diff, axis=1)
+    rows = np.arange(A.shape[0])
+    return diff[rows, first] & (A[rows, first] < B[rows, first])
+
+
+def canonicalize_batch(S: np.ndarray) -> np.ndarray:
+    """Row-wise symValidator.canonical_form: smallest of s, -s, reversed s, -reversed s."""
+    best = S.copy()
+    for V in (-S, S[:, ::-1], -S[:, ::-1]):
+        less = _lex_less(V, best)
+        best[less] = V[less]
+    return best
+
+
+def _merge_duplicates(S: np.ndarray, shots: np.ndarray):
+    """Unique rows (first-seen order) with summed shot counts."""
+    _, first, inverse = np.unique(S, axis=0, return_index=True, return_inverse=True)
+    summed = np.bincount(inverse.ravel(), weights=shots, minlength=len(first)).astype(np.int64)
+    order = np.argsort(first, kind="stable")
+    return S[first[order]], summed[order]
+
+
+def counts_to_population(
+    counts,
+    num_samples: int | None = None,
+    dedupe: bool = False,
+    top_k: int | None = None,
+    canonicalize: bool = False,
+    return_energies: bool = False,
+):
+    """
+    Turn a sample-counts mapping (cudaq SampleResult or dict) into a ±1
+    population matrix.
+
+    Default: every shot becomes a row, in counts order, cut at num_samples
+    (same as resolve_sample_result). canonicalize maps each sample to its
+    canonical form first, so symmetric samples count as the same one.
+    dedupe keeps each distinct sequence once. top_k keeps the k lowest-energy
+    distinct sequences (implies dedupe; ties go to the more frequent sample).
+    """
+    S, shots = counts_to_arrays(counts)
+    if canonicalize and len(S):
+        S = canonicalize_batch(S)
+    if (dedupe or top_k is not None or canonicalize) and len(S):
+        S, shots = _merge_duplicates(S, shots)
+        if not dedupe and top_k is None:
+            # canonicalize only: keep one row per shot
+            S = np.repeat(S, shots, axis=0)
+    elif len(S):
+        S = np.repeat(S, shots, axis=0)
+
+    E = None
+    if top_k is not None and len(S):
+        E = labs_energy_batch(S)
+        order = np.lexsort((-shots, E))[:top_k]
+        S, E = S[order], E[order]
+
+    if num_samples is not None:
+        S = S[:num_samples]
+        E = None if E is None else E[:num_samples]
+
+    if return_energies:
+        return S, (labs_energy_batch(S) if E is None else E)
+    return S
+
+
+def resolve_sample_result(handle_or_counts, N, num_samples, **options):
+    """Drop-in for the notebook helper; accepts an async handle or the counts."""
+    counts = handle_or_counts if hasattr(handle_or_counts, "items") else handle_or_counts.get()
+    pop = counts_to_population(counts, num_samples=num_samples, **options)
+    if pop.size and pop.shape[1] != N:
+        raise ValueError(f"sampled bitstrings have length {pop.shape[1]}, expected N={N}")
+    return pop
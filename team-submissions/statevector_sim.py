@@ -0,0 +1,278 @@
+# statevector_sim.py
+# Dependency-free statevector simulator for the LABS kernels, for tests and
+# CPU profiling without the cudaq runtime. The kernels are rewritten as
+# Python builders that record gates on a Circuit (same names, arguments and
+# gate order as the @cudaq.kernel versions in the notebooks):
+#   prepare_state, mps_ansatz, trotterized_circuit, plus the rzz composite
+#   and the 2-/4-qubit rotation blocks.
+# Before simulation, runs of gates that stay within max_fused qubits are
+# multiplied into one dense block, so the 2^N state is swept once per block
+# instead of once per gate.
+#
+# Conventions follow cudaq: rx/ry/rz(theta) = exp(-i theta P / 2), qubit 0 is
+# the leftmost character of a sampled bitstring (and the most significant bit
+# of a state index), '1' means |1> (Z = -1, spin -1).
+import numpy as np
+
+from labs_hamiltonian import diagonal_expectation
+
+MAX_QUBITS = 26
+
+_H = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+_X = np.array([[0, 1], [1, 0]], dtype=complex)
+_CX = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]], dtype=complex)
+
+
+def _rx(theta):
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -1j * s], [-1j * s, c]], dtype=complex)
+
+
+def _ry(theta):
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -s], [s, c]], dtype=complex)
+
+
+def _rz(theta):
+    return np.diag([np.exp(-0.5j * theta), np.exp(0.5j * theta)])
+
+
+# -------------------------
+# 1) Circuits and kernels
+# -------------------------
+class Circuit:
+    """Gate list on n qubits: ops[i] = (qubits tuple, 2^k x 2^k unitary)."""
+
+    def __init__(self, n_qubits: int):
+        self.n_qubits = n_qubits
+        self.ops = []
+
+    def _add(self, U, *qubits):
+        self.ops.append((tuple(int(q) for q in qubits), U))
+
+    def h(self, q):
+        self._add(_H, q)
+
+    def x(self, q):
+        self._add(_X, q)
+
+    def rx(self, theta, q):
+        self._add(_rx(theta), q)
+
+    def ry(self, theta, q):
+        self._add(_ry(theta), q)
+
+    def rz(self, theta, q):
+        self._add(_rz(theta), q)
+
+    def cx(self, control, target):
+        """x.ctrl(control, target)."""
+        self._add(_CX, control, target)
+
+
+def rzz(c: Circuit, q0, q1, theta):
+    c.cx(q0, q1)
+    c.rz(theta, q1)
+    c.cx(q0, q1)
+
+
+def two_qubit_rotation_block(c: Circuit, q0, q1, theta):
+    pi = np.pi
+    c.rx(pi / 2.0, q1)
+    rzz(c, q0, q1, theta)
+    c.rx(pi / 2.0, q0)
+    c.rx(-pi / 2.0, q1)
+    rzz(c, q0, q1, theta)
+    c.rx(-pi / 2.0, q0)
+
+
+def four_qubit_rotation_block(c: Circuit, q0, q1, q2, q3, theta):
+    pi = np.pi
+    c.rx(-pi / 2.0, q0)
+    c.ry(pi / 2.0, q1)
+    c.ry(-pi / 2.0, q2)
+    rzz(c, q0, q1, -pi / 2.0)
+    rzz(c, q2, q3, -pi / 2.0)
+    c.rx(pi / 2.0, q0)
+    c.ry(-pi / 2.0, q1)
+    c.ry(pi / 2.0, q2)
+    c.rx(-pi / 2.0, q3)
+    c.rx(-pi / 2.0, q1)
+    c.rx(-pi / 2.0, q2)
+    rzz(c, q1, q2, theta)
+    c.rx(pi / 2.0, q1)
+    c.rx(pi, q2)
+    c.ry(pi / 2.0, q1)
+    rzz(c, q0, q1, pi / 2.0)
+    c.rx(pi / 2.0, q0)
+    c.ry(-pi / 2.0, q2)
+    rzz(c, q1, q2, -theta)
+    c.rx(pi / 2.0, q1)
+    c.rx(-pi, q2)
+    rzz(c, q1, q2, -theta)
+    c.rx(-pi, q1)
+    c.ry(pi / 2.0, q2)
+    rzz(c, q2, q3, -pi / 2.0)
+    c.ry(-pi / 2.0, q2)
+    c.rx(-pi / 2.0, q3)
+    c.rx(-pi / 2.0, q2)
+    rzz(c, q1, q2, theta)
+    c.rx(pi / 2.0, q1)
+    c.rx(pi / 2.0, q2)
+    c.ry(-pi / 2.0, q1)
+    c.ry(pi / 2.0, q2)
+    rzz(c, q0, q1, pi / 2.0)
+    rzz(c, q2, q3, pi / 2.0)
+    c.ry(pi / 2.0, q1)
+    c.ry(-pi / 2.0, q2)
+    c.rx(pi / 2.0, q3)
+
+
+def prepare_state(bits) -> Circuit:
+    c = Circuit(len(bits))
+    for i, b in enumerate(bits):
+        if b == 1:
+            c.x(i)
+    return c
+
+
+def mps_ansatz(qubit_count: int, layers: int, parameters) -> Circuit:
+    c = Circuit(qubit_count)
+    for q in range(qubit_count):
+        c.h(q)
+    param_idx = 0
+    for _ in range(layers):
+        for i in range(qubit_count):
+            c.ry(parameters[param_idx], i)
+            param_idx += 1
+        for i in range(qubit_count - 1):
+            c.cx(i, i + 1)
+    return c
+
+
+def trotterized_circuit(N: int, G2, G4, steps: int, dt: float, T: float, thetas) -> Circuit:
+    c = Circuit(N)
+    for q in range(N):
+        c.h(q)
+    for n in range(steps):
+        theta = thetas[n]
+        for pair in G2:
+            two_qubit_rotation_block(c, pair[0], pair[1], theta)
+        for quad in G4:
+            four_qubit_rotation_block(c, quad[0], quad[1], quad[2], quad[3], theta)
+    return c
+
+
+# -------------------------
+# 2) Gate fusion and simulation
+# -------------------------
+def _apply(psi: np.ndarray, U: np.ndarray, axes) -> np.ndarray:
+    """Apply a 2^k x 2^k U to the given axes of a (2,)*n (+ trailing) tensor."""
+    k = len(axes)
+    out = np.tensordot(U.reshape((2,) * (2 * k)), psi, axes=(range(k, 2 * k), axes))
+    return np.moveaxis(out, range(k), axes)
+
+
+def _embed(U: np.ndarray, qubits, block) -> np.ndarray:
+    """U acting on qubits, as a matrix on the (superset) block qubit order."""
+    m = len(block)
+    eye = np.eye(2**m, dtype=complex).reshape((2,) * m + (2**m,))
+    return _apply(eye, U, [block.index(q) for q in qubits]).reshape(2**m, 2**m)
+
+
+def fuse(ops, max_fused: int = 4):
+    """
+    Merge gates into dense blocks of at most max_fused qubits. A gate joins
+    the most recent block that touches any of its qubits (only gates on
+    disjoint qubits can lie in between, and those commute with it); if that
+    would exceed max_fused qubits a new block starts.
+    """
+    blocks = []   # [qubits list, matrix]
+    last = {}     # qubit -> index of the latest block touching it
+    for qubits, U in ops:
+        touching = [last[q] for q in qubits if q in last]
+        b = max(touching) if touching else None
+        if b is not None:
+            merged = blocks[b][0] + [q for q in qubits if q not in blocks[b][0]]
+            if len(merged) <= max_fused:
+                old_q, old_U = blocks[b]
+                if len(merged) > len(old_q):
+                    old_U = _embed(old_U, old_q, merged)
+                blocks[b] = [merged, _embed(U, qubits, merged) @ old_U]
+                for q in qubits:
+                    last[q] = b
+                continue
+        blocks.append([list(qubits), U])
+        for q in qubits:
+            last[q] = len(blocks) - 1
+    return [(tuple(q), U) for q, U in blocks]
+
+
+def simulate(circuit: Circuit, max_fused: int = 4, psi0=None) -> np.ndarray:
+    """Final statevector (2^n,) complex128, from |0...0> unless psi0 is given."""
+    n = circuit.n_qubits
+    if n > MAX_QUBITS:
+        raise ValueError(f"{n} qubits exceeds the statevector limit of {MAX_QUBITS}")
+    if psi0 is None:
+        psi = np.zeros(2**n, dtype=complex)
+        psi[0] = 1.0
+    else:
+        psi = np.array(psi0, dtype=complex)
+    psi = psi.reshape((2,) * n)
+    ops = fuse(circuit.ops, max_fused) if max_fused else circuit.ops
+    for qubits, U in ops:
+        psi = _apply(psi, U, qubits)
+    return np.ascontiguousarray(psi).reshape(-1)
+
+
+# -------------------------
+# 3) observe / sample
+# -------------------------
+def _z_masks(idx: np.ndarray, n: int) -> np.ndarray:
+    """Bit mask of each Z-term (rows of qubit indices) in the state-index bit order."""
+    return np.sum(np.left_shift(np.int64(1), n - 1 - np.asarray(idx, dtype=np.int64)), axis=1)
+
+
+def z_term_expectations(probs: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """
+    <Z_a Z_b ...> for every row of idx, from basis-state probabilities.
+    <Z_mask> = sum_x p(x) (-1)^popcount(x & mask) is entry mask of the
+    Walsh-Hadamard transform of p, done in place: O(n 2^n) time, O(2^n) memory.
+    """
+    n = int(np.log2(probs.size))
+    w = np.array(probs, dtype=np.float64)
+    for q in range(n):
+        y = w.reshape(-1, 2, 1 << q)
+        a = y[:, 0].copy()
+        y[:, 0] += y[:, 1]
+        a -= y[:, 1]
+        y[:, 1] = a
+    return w[_z_masks(idx, n)]
+
+
+def observe(circuit: Circuit, hamiltonian, max_fused: int = 4) -> float:
+    """
+    <H>, with H either the (2^N,) diagonal (labs_hamiltonian.diagonal_vector,
+    one dot product) or a labs_hamiltonian_terms dict (term by term).
+    """
+    psi = simulate(circuit, max_fused)
+    if isinstance(hamiltonian, np.ndarray):
+        return diagonal_expectation(psi, hamiltonian)
+    terms = hamiltonian
+    probs = np.abs(psi)**2
+    E = float(terms["constant"])
+    if len(terms["idx2"]):
+        E += float(terms["coef2"] @ z_term_expectations(probs, terms["idx2"]))
+    if len(terms["idx4"]):
+        E += float(terms["coef4"] @ z_term_expectations(probs, terms["idx4"]))
+    return E
+
+
+def sample(circuit: Circuit, shots_count: int = 1000, seed=None, max_fused: int = 4) -> dict:
+    """cudaq.sample-style counts {bitstring: shots}, qubit 0 first."""
+    n = circuit.n_qubits
+    cdf = np.cumsum(np.abs(simulate(circuit, max_fused))**2)
+    rng = np.random.default_rng(seed)
+    draws = np.searchsorted(cdf, rng.random(shots_count) * cdf[-1], side="right")
+    states, counts = np.unique(np.minimum(draws, cdf.size - 1), return_counts=True)
+    return {format(int(s), f"0{n}b"): int(c) for s, c in zip(states, counts)}
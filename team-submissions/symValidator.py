@@ -23,13 +23,24 @@ def labs_energy(s):
 
 # brute force enumeration for small N
 import itertools
+from labs_batch import labs_energy_batch
+from labs_skew import skew_expand, skew_energy_batch, skew_free_len
 
 def brute_force_labs(N):
-    energies = {}
-    for bits in itertools.product([-1, 1], repeat=N):
-        energies[bits] = labs_energy(bits)
+    seqs = np.array(list(itertools.product([-1, 1], repeat=N)), dtype=np.int8)
+    # score all 2^N sequences in one batched pass
+    energies = labs_energy_batch(seqs)
+    order = np.argsort(energies, kind="stable")
     # return sorted list of (sequence, energy)
-    return sorted(energies.items(), key=lambda t: t[1])
+    return [(tuple(int(a) for a in seqs[i]), int(energies[i])) for i in order]
+
+def brute_force_labs_skew(N):
+    """brute_force_labs over the 2^((N+1)/2) skew-symmetric sequences only (odd N)."""
+    halves = np.array(list(itertools.product([-1, 1], repeat=skew_free_len(N))), dtype=np.int8)
+    seqs = skew_expand(halves)
+    energies = skew_energy_batch(halves)
+    order = np.argsort(energies, kind="stable")
+    return [(tuple(int(a) for a in seqs[i]), int(energies[i])) for i in order]
 
 
 # symmetry positive tests (must pass)
@@ -79,6 +90,10 @@ def dihedral_orbit(s):
     ]
     return {tuple(op(s)) for op in ops}
 
+def canonical_form(s):
+    """Representative of s's orbit: the lexicographically smallest member."""
+    return min(dihedral_orbit(int(a) for a in s))
+
 
 # CELL: small test suite runner
 def run_all_tests():
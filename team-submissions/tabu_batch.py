@@ -0,0 +1,183 @@
+# tabu_batch.py
+# Lock-step batched tabu search: B independent searches advance together.
+# State is a (B, N) spin matrix, (B, N-1) correlations, the (B, N, N-1)
+# neighbour-sum table A and (B, N) flip deltas (same table as mts_core), and
+# every iteration is a handful of array ops over the whole batch instead of B
+# Python-level tabu steps.
+#
+# Same move rules as tabu_search_pm1 (candidate subset, aspiration, tabu
+# tenure with jitter, ignore tabu when all candidates are blocked), but the
+# random draws come from one batch-wide Generator, so row b does not reproduce
+# a tabu_search_pm1 call with the same seed.
+import time
+
+import numpy as np
+
+from labs_batch import as_pm1_matrix, labs_correlations_batch
+from labs_store import resolve_target_E
+from mts_core import init_population, make_child, insert_result, pm1_to_bits01
+
+_BLOCKED = np.inf
+
+
+def _init_batch_tables(S: np.ndarray):
+    """A[b, j, k-1] = s[j+k] + s[j-k] (0 outside) and Q = sum_k A^2, as float32 for BLAS."""
+    B, N = S.shape
+    pad = np.zeros((B, 3 * N - 2), dtype=np.float32)
+    pad[:, N - 1:2 * N - 1] = S
+    j = np.arange(N)[:, None]
+    k = np.arange(1, N)[None, :]
+    A = pad[:, j + k + N - 1] + pad[:, j - k + N - 1]
+    Q = np.einsum("bjk,bjk->bj", A, A)
+    return A, Q
+
+
+def _flip_deltas_batch(S, C, A, Q):
+    # every entry and partial sum is an integer below 2N^2 < 2^24, so float32 is
+    # exact and the (B, N, N-1) x (B, N-1) product can go to BLAS
+    return 4.0 * (Q - S * np.matmul(A, C[:, :, None])[:, :, 0])
+
+
+def tabu_search_batch(
+    S0,
+    max_iters: int = 1000,
+    tabu_tenure: int = 30,
+    candidate_size: int = 64,
+    rng: np.random.Generator | None = None,
+    target_E: int | None = None,
+):
+    """
+    Run B tabu searches in lock-step from the rows of S0.
+    Returns (best_S (B, N) int8, best_E (B,) int64). With target_E, a row
+    that reaches it is frozen; the loop ends when all rows are frozen.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    S = as_pm1_matrix(S0).astype(np.float32)
+    B, N = S.shape
+    C = labs_correlations_batch(S0).astype(np.float32)
+    E = np.sum(C.astype(np.float64)**2, axis=1)  # energies can pass 2^24, keep them float64
+    A, Q = _init_batch_tables(S)
+    dE = _flip_deltas_batch(S, C, A, Q)
+
+    best_S = S.copy()
+    best_E = E.copy()
+    tabu_until = np.zeros((B, N), dtype=np.int64)
+    active = np.ones(B, dtype=bool) if target_E is None else best_E > target_E
+    jitter_hi = max(1, tabu_tenure // 3)
+    rows = np.arange(B)
+    cols = np.arange(N)
+
+    for it in range(1, max_iters + 1):
+        # frozen rows keep stepping (cheaper than compacting the batch) but
+        # never update their best again
+        if not active.any():
+            break
+
+        # candidate subset per row: the candidate_size smallest random keys
+        E_cand = E[:, None] + dE
+        if candidate_size < N:
+            pick = np.argpartition(rng.random((B, N)), candidate_size - 1, axis=1)[:, :candidate_size]
+            cand = np.zeros((B, N), dtype=bool)
+            np.put_along_axis(cand, pick, True, axis=1)
+        else:
+            cand = np.ones((B, N), dtype=bool)
+
+        # best admissible (tabu allowed only if aspiration); all blocked -> ignore tabu
+        admissible = cand & ((tabu_until <= it) | (E_cand < best_E[:, None]))
+        none_ok = ~admissible.any(axis=1)
+        admissible[none_ok] = cand[none_ok]
+        j = np.argmin(np.where(admissible, E_cand, _BLOCKED), axis=1)
+
+        # apply flips: C -= 2 s_j A[j]; every other row i sees s_j at lag |i-j|
+        E = E_cand[rows, j]
+        sj = S[rows, j]
+        C -= (2.0 * sj)[:, None] * A[rows, j]
+        lag = np.abs(cols[None, :] - j[:, None]) - 1
+        bi, ii = np.nonzero(lag >= 0)
+        li = lag[bi, ii]
+        old = A[bi, ii, li]
+        new = old - 2.0 * sj[bi]
+        A[bi, ii, li] = new
+        Q[bi, ii] += new * new - old * old
+        S[rows, j] = -sj
+        dE = _flip_deltas_batch(S, C, A, Q)
+
+        tabu_until[rows, j] = it + tabu_tenure + rng.integers(0, jitter_hi, size=B)
+
+        better = active & (E < best_E)
+        if better.any():
+            best_E[better] = E[better]
+            best_S[better] = S[better]
+            if target_E is not None:
+                active &= best_E > target_E
+
+    return best_S.astype(np.int8), np.rint(best_E).astype(np.int64)
+
+
+def mts_batched(
+    N: int,
+    pop_size: int = 32,
+    initial_pop: np.ndarray = None, # for quantum algo output
+    p_combine: float = 0.7,
+    p_mut: float = 1.0/50.0,
+    mts_iters: int = 1000,
+    tabu_iters: int = 800,
+    tabu_tenure: int = 30,
+    candidate_size: int = 64,
+    target_E: int | str | None = None, # "known": best-known E from labs_store
+    seed: int = 0,
+    batch_size: int = 32,
+    verbose_every: int = 100,
+):
+    """
+    Generational MTS on the lock-step engine: each round makes batch_size
+    children from the current population, improves them all with one
+    tabu_search_batch call and merges the results in order with the
+    mts_quant1 replace/elitism rules. mts_iters counts tabu runs; a round
+    is cut at the first child that reaches target_E.
+    """
+    target_E = resolve_target_E(N, target_E)
+    rng = np.random.default_rng(seed)
+    pop, pop_E = init_population(N, pop_size, initial_pop, rng, verbose_every > 0)
+
+    best_idx = int(np.argmin(pop_E))
+    best_s = pop[best_idx].copy()
+    best_E = int(pop_E[best_idx])
+
+    trace = [best_E]
+    t0 = time.time()
+    done = 0
+    rounds = 0
+
+    while done < mts_iters:
+        if target_E is not None and best_E <= target_E:
+            break
+
+        n_children = min(batch_size, mts_iters - done)
+        children = np.stack([make_child(pop, pop_size, p_combine, p_mut, rng)
+                             for _ in range(n_children)])
+        result_S, result_E = tabu_search_batch(children, tabu_iters, tabu_tenure,
+                                               candidate_size, rng, target_E)
+        rounds += 1
+
+        for result_s, r_E in zip(result_S, result_E):
+            best_s, best_E = insert_result(pop, pop_E, best_s, best_E, result_s, int(r_E), rng)
+            trace.append(best_E)
+            done += 1
+            if verbose_every and (done % verbose_every == 0):
+                print(f"[MTS-batch {done:5d}] best_E={best_E}  elapsed={time.time()-t0:.2f}s")
+            if target_E is not None and best_E <= target_E:
+                break
+
+    return {
+        "best_s_pm1": best_s,
+        "best_s_01": pm1_to_bits01(best_s),
+        "best_E": best_E,
+        "best_trace": np.array(trace, dtype=np.int64),
+        "population_pm1": pop,
+        "population_E": pop_E.copy(),
+        "elapsed_sec": time.time() - t0,
+        "rounds": rounds,
+        "tabu_runs": done,
+    }
@@ -0,0 +1,790 @@
+# testClassical.py
+# CPU-only checks for the classical LABS kernels (no cudaq needed).
+# Run from team-submissions/:  python testClassical.py
+import json
+import os
+import threading
+import tempfile
+import unittest
+import numpy as np
+
+from symValidator import labs_energy, brute_force_labs, brute_force_labs_skew, canonical_form
+from labs_batch import labs_energy_batch, labs_correlations_batch
+from labs_bitpack import pack_pm1, unpack_pm1, packed_flip, packed_flip_energies, packed_energy
+from mts_core import (
+    labs_correlations_pm1, labs_energy_pm1, init_flip_table, flip_deltas_pm1,
+    apply_flip_pm1, tabu_search_pm1, tabu_search_pm1_reference, mts_quant1, resume_mts_quant1,
+    insert_result,
+    skew_move_deltas, tabu_search_skew,
+)
+from mts_parallel import mts_parallel
+from mts_stats import MTSStats, population_diversity
+from mts_population import PopulationIndex, canonical_key
+from mts_jit import tabu_search_jit, labs_energy_jit
+from tabu_batch import tabu_search_batch, mts_batched
+from mts_islands import mts_islands, migration_targets
+from labs_exact import enumerate_labs_exact, merge_exact_results, branch_and_bound_labs
+from labs_store import KNOWN_OPTIMA, best_known, record_result, exact_reference
+from labs_hamiltonian import (
+    labs_hamiltonian_terms, diagonal_energies, build_diagonal, diagonal_vector, counts_energies,
+)
+from sample_population import counts_to_population, resolve_sample_result
+from labs_interactions import get_interactions, get_interaction_lists
+from labs_skew import skew_expand, skew_free_part, is_skew_symmetric, skew_energy_batch, skew_optimum
+from hybrid_pipeline import mts_pipelined
+from labs_benchmark import run_tts_benchmark, summarize, fit_scaling, write_results, compare_results
+from qite_gradients import (
+    observe_batch, parameter_shift_gradients, parameter_shift_gradients_serial, spsa_gradients, run_varqite,
+)
+import auxiliary_files.labs_utils as utils
+import statevector_sim as sv
+import mps_sim
+
+
+def random_pop(rng, B, N):
+    return rng.choice(np.array([-1, 1], dtype=np.int8), size=(B, N))
+
+
+class TestBatchEnergy(unittest.TestCase):
+    def test_batch_matches_reference(self):
+        """Verify: batched energies == per-sequence labs_energy"""
+        rng = np.random.default_rng(1)
+        for N in [2, 3, 7, 16, 33]:
+            S = random_pop(rng, 25, N)
+            E = labs_energy_batch(S)
+            self.assertEqual(E.tolist(), [labs_energy(row) for row in S])
+
+    def test_fft_matches_direct(self):
+        """Verify: FFT autocorrelation path == direct per-lag path"""
+        rng = np.random.default_rng(2)
+        for N in [5, 64, 150]:
+            S = random_pop(rng, 40, N)
+            C_direct = labs_correlations_batch(S, method="direct")
+            C_fft = labs_correlations_batch(S, method="fft")
+            np.testing.assert_array_equal(C_direct, C_fft)
+
+
+class TestFlipDeltaTable(unittest.TestCase):
+    def test_deltas_track_true_energy(self):
+        """Verify: table deltas == E(flipped) - E(s) after a run of accepted flips"""
+        rng = np.random.default_rng(3)
+        N = 23
+        s = random_pop(rng, 1, N)[0]
+        C = labs_correlations_pm1(s)
+        A, Q = init_flip_table(s)
+        for j in rng.integers(0, N, size=40):
+            E = labs_energy_pm1(s)
+            dE = flip_deltas_pm1(s, C, A, Q)
+            for i in range(N):
+                t = s.copy()
+                t[i] *= -1
+                self.assertEqual(int(dE[i]), labs_energy_pm1(t) - E)
+            apply_flip_pm1(s, C, A, Q, int(j))
+            np.testing.assert_array_equal(C, labs_correlations_pm1(s))
+
+    def test_tabu_matches_reference(self):
+        """Verify: table-driven tabu search == original scalar tabu search"""
+        for N, cand in [(12, 64), (40, 16)]:
+            s0 = random_pop(np.random.default_rng(N), 1, N)[0]
+            fast = tabu_search_pm1(s0, max_iters=150, candidate_size=cand,
+                                   rng=np.random.default_rng(7))
+            ref = tabu_search_pm1_reference(s0, max_iters=150, candidate_size=cand,
+                                            rng=np.random.default_rng(7))
+            self.assertEqual(fast[1], ref[1])
+            np.testing.assert_array_equal(fast[0], ref[0])
+
+
+class TestParallelMTS(unittest.TestCase):
+    def test_worker_count_does_not_change_result(self):
+        """Verify: same seed and batch_size give the same run on 1 or 2 workers"""
+        kw = dict(N=16, pop_size=12, mts_iters=12, tabu_iters=60, batch_size=6,
+                  seed=11, verbose_every=0)
+        serial = mts_parallel(n_workers=1, **kw)
+        pooled = mts_parallel(n_workers=2, **kw)
+        self.assertEqual(serial["best_E"], pooled["best_E"])
+        np.testing.assert_array_equal(serial["best_trace"], pooled["best_trace"])
+        np.testing.assert_array_equal(serial["population_pm1"], pooled["population_pm1"])
+        self.assertEqual(serial["best_E"], labs_energy(serial["best_s_pm1"]))
+
+
+class TestIslandMTS(unittest.TestCase):
+    def test_topologies(self):
+        self.assertEqual(migration_targets(3, "ring"), [[1], [2], [0]])
+        self.assertEqual(migration_targets(3, "full"), [[1, 2], [0, 2], [0, 1]])
+
+    def test_islands_report_consistent_energies(self):
+        """Verify: migration keeps every island's population energies correct"""
+        res = mts_islands(N=14, n_islands=3, island_pop_size=6, mts_iters=12,
+                          tabu_iters=40, migration_interval=4, topology="full",
+                          seed=5, verbose_every=0)
+        self.assertEqual(len(res["island_traces"]), 3)
+        self.assertEqual(res["best_E"], labs_energy(res["best_s_pm1"]))
+        self.assertEqual(res["population_E"].tolist(),
+                         [labs_energy(s) for s in res["population_pm1"]])
+
+
+class TestExactEnumeration(unittest.TestCase):
+    def test_matches_brute_force(self):
+        """Verify: symmetry-reduced Gray-code enumeration == full brute force"""
+        for N in range(2, 15):
+            bf = brute_force_labs(N)
+            n_opt = sum(1 for _, e in bf if e == bf[0][1])
+            res = enumerate_labs_exact(N)
+            self.assertEqual(res["best_E"], bf[0][1])
+            self.assertEqual(res["n_optimal"], n_opt)
+            self.assertLess(res["visited"], 2**N)
+
+    def test_shards_merge(self):
+        full = enumerate_labs_exact(17)
+        merged = merge_exact_results([enumerate_labs_exact(17, shard=(i, 4)) for i in range(4)])
+        self.assertEqual(merged["best_E"], full["best_E"])
+        self.assertEqual(merged["optimal_canonical"], full["optimal_canonical"])
+        self.assertEqual(merged["visited"], full["visited"])
+
+    def test_branch_and_bound_proves_optimum(self):
+        """Verify: B&B from a poor incumbent reaches the enumerated optimum"""
+        for N in [5, 8, 13, 18]:
+            exact = enumerate_labs_exact(N)["best_E"]
+            res = branch_and_bound_labs(N, incumbent=[1] * N)
+            self.assertEqual(res["best_E"], exact)
+            self.assertEqual(res["best_E"], labs_energy(res["best_s_pm1"]))
+            self.assertTrue(res["certificate"]["optimal"])
+            self.assertEqual(res["certificate"]["lower_bound"], exact)
+
+    def test_branch_and_bound_certificate_sources(self):
+        """Verify: incumbent_source keeps the seed's origin; improved_by_search is separate"""
+        bad = [1] * 13
+        res = branch_and_bound_labs(13, incumbent=bad)
+        cert = res["certificate"]
+        self.assertEqual(cert["incumbent_source"], "given")
+        self.assertEqual(cert["incumbent_E"], labs_energy(bad))
+        self.assertTrue(cert["improved_by_search"])
+        self.assertLess(res["best_E"], cert["incumbent_E"])
+
+        cert = branch_and_bound_labs(13, incumbent=res["best_s_pm1"])["certificate"]
+        self.assertEqual((cert["incumbent_source"], cert["incumbent_E"]), ("given", res["best_E"]))
+        self.assertFalse(cert["improved_by_search"])
+
+
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "labs.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_known_optima_match_enumeration(self):
+        """Verify: literature table == our own exact enumeration for small N"""
+        for N in range(2, 23):
+            self.assertEqual(KNOWN_OPTIMA[N], enumerate_labs_exact(N)["best_E"])
+
+    @unittest.skipUnless(os.environ.get("LABS_SLOW_TESTS"), "set LABS_SLOW_TESTS=1 (about a minute)")
+    def test_known_optima_match_enumeration_slow(self):
+        """Verify: literature table == exact enumeration for N = 23..30"""
+        for N in range(23, 31):
+            self.assertEqual(KNOWN_OPTIMA[N], enumerate_labs_exact(N)["best_E"])
+
+    def test_record_and_read_back(self):
+        s = random_pop(np.random.default_rng(4), 1, 70)[0]
+        E = labs_energy(s)
+        self.assertTrue(record_result(70, E, s, method="mts", wall_sec=1.5, path=self.path))
+        rec = best_known(70, path=self.path)
+        self.assertEqual(rec["E"], E)
+        self.assertFalse(rec["proven"])
+        self.assertEqual(labs_energy(rec["s_pm1"]), E)
+        self.assertEqual(exact_reference(13, path=self.path), 6)
+
+    def test_rejects_impossible_records(self):
+        """Verify: the store catches energies that break physics"""
+        with self.assertRaises(ValueError):
+            record_result(13, 4, path=self.path)  # below the proven optimum
+        with self.assertRaises(ValueError):
+            record_result(4, 2, [1, 1, 1, 1], path=self.path)  # wrong energy for s
+
+
+class TestHamiltonianTerms(unittest.TestCase):
+    def test_terms_reproduce_energy(self):
+        """Verify: collected Z terms evaluated on ±1 spins == labs_energy"""
+        rng = np.random.default_rng(8)
+        for N in [2, 3, 4, 9, 16]:
+            t = labs_hamiltonian_terms(N)
+            S = random_pop(rng, 30, N).astype(np.int64)
+            E = (t["constant"]
+                 + np.prod(S[:, t["idx2"]], axis=2) @ t["coef2"]
+                 + np.prod(S[:, t["idx4"]], axis=2) @ t["coef4"])
+            self.assertEqual(E.tolist(), [labs_energy(row) for row in S])
+
+    def test_diagonal_verification(self):
+        """Verify: diagonal basis-state energies == labs_energy (|1> -> -1 spin)"""
+        rng = np.random.default_rng(9)
+        bits = rng.integers(0, 2, size=(200, 21)).astype(np.int8)
+        E = diagonal_energies(bits, chunk_terms=5000)
+        self.assertEqual(E.tolist(), [labs_energy(1 - 2 * b.astype(int)) for b in bits])
+        self.assertEqual(int(diagonal_energies([0, 0, 0, 1])[0]), 2)  # Barker N=4
+
+    def test_cached_and_read_only(self):
+        self.assertIs(labs_hamiltonian_terms(12), labs_hamiltonian_terms(12))
+        self.assertFalse(labs_hamiltonian_terms(12)["coef4"].flags.writeable)
+
+
+class TestSamplePopulation(unittest.TestCase):
+    counts = {"0010": 2, "0100": 1, "1101": 3, "0000": 1}
+
+    def test_bulk_conversion_matches_per_shot(self):
+        """Verify: '0' -> +1, '1' -> -1, one row per shot, cut at num_samples"""
+        expected = []
+        for bits, n in self.counts.items():
+            expected += [[1 if b == "0" else -1 for b in bits]] * n
+        pop = resolve_sample_result(self.counts, 4, 5)
+        self.assertEqual(pop.dtype, np.int8)
+        self.assertEqual(pop.tolist(), expected[:5])
+
+    def test_canonical_top_k(self):
+        # 0010, 0100 and 1101 are one symmetry orbit (reverse / flip+reverse)
+        pop, E = counts_to_population(self.counts, top_k=3, canonicalize=True,
+                                      return_energies=True)
+        self.assertEqual(len(pop), 2)
+        self.assertEqual(E.tolist(), sorted(labs_energy(s) for s in pop))
+        for s in pop:
+            self.assertEqual(tuple(s), canonical_form(s))
+
+
+class TestThetaSchedule(unittest.TestCase):
+    def test_vectorized_matches_per_step(self):
+        """Verify: ThetaSchedule.thetas == [compute_theta(step*dt, ...)] per step"""
+        N, T, n_steps = 9, 1.0, 7
+        dt = T / n_steps
+        t = labs_hamiltonian_terms(N)
+        G2, G4 = t["idx2"].tolist(), t["idx4"].tolist()
+        ref = [utils.compute_theta(step * dt, dt, T, N, G2, G4) for step in range(1, n_steps + 1)]
+        sched = utils.get_theta_schedule(N, G2, G4)
+        np.testing.assert_allclose(sched.thetas(n_steps, dt, T), ref, rtol=1e-12, atol=0)
+        self.assertIs(utils.get_theta_schedule(N, [list(g) for g in G2], G4), sched)
+        # the same list objects hit the identity cache, without a content key
+        hit = utils._BY_ID[(N, len(G2), len(G4), id(G2), id(G4))]
+        self.assertIs(hit[2], sched)
+        self.assertIs(utils.get_theta_schedule(N, G2, G4), sched)
+        self.assertEqual(sched.thetas(3, dt, 0).tolist(), [0.0, 0.0, 0.0])
+
+
+class TestInteractions(unittest.TestCase):
+    @staticmethod
+    def loop_interactions(N):
+        # the tutorial's get_interactions loops
+        G2 = [[i, i + k] for i in range(N - 2) for k in range(1, (N - 1 - i) // 2 + 1)]
+        G4 = [[i, i + t, i + k, i + k + t] for i in range(N - 3)
+              for t in range(1, (N - 2 - i) // 2 + 1) for k in range(t + 1, N - i - t)]
+        return G2, G4
+
+    def test_matches_loops(self):
+        """Verify: vectorized G2/G4 == loop construction, same order, int32"""
+        with tempfile.TemporaryDirectory() as d:
+            for N in (4, 5, 8, 13, 24):
+                G2, G4 = get_interactions(N, d)
+                self.assertEqual((G2.dtype, G4.dtype), (np.int32, np.int32))
+                self.assertEqual((G2.tolist(), G4.tolist()), self.loop_interactions(N))
+            get_interactions.cache_clear()
+            G2, G4 = get_interactions(13, d)  # from disk
+            self.assertEqual((G2.tolist(), G4.tolist()), self.loop_interactions(13))
+            self.assertEqual(get_interaction_lists(9, d), self.loop_interactions(9))
+            self.assertTrue(os.path.exists(os.path.join(d, "interactions_N9.npz")))
+        G2, G4 = get_interactions(9, None)
+        self.assertEqual((G2.tolist(), G4.tolist()), self.loop_interactions(9))
+        self.assertRaises(ValueError, get_interactions, 3, None)
+
+
+class TestQiteGradients(unittest.TestCase):
+    a = np.array([1.0, -2.0, 0.5, 3.0])
+
+    def energy_batch(self, P):
+        # sinusoidal in each parameter, so the pi/2 shift rule is exact
+        P = np.atleast_2d(P)
+        self.calls += 1
+        return np.cos(P) @ self.a + np.sin(P[:, 0]) * np.sin(P[:, 1])
+
+    def setUp(self):
+        self.calls = 0
+
+    def exact_grad(self, p):
+        g = -self.a * np.sin(p)
+        g[0] += np.cos(p[0]) * np.sin(p[1])
+        g[1] += np.sin(p[0]) * np.cos(p[1])
+        return g
+
+    def test_batched_matches_serial_and_exact(self):
+        """Verify: one-batch parameter shift == serial loop == analytic gradient"""
+        p = np.random.default_rng(0).uniform(-np.pi, np.pi, 4)
+        E, g = parameter_shift_gradients(self.energy_batch, p, with_energy=True)
+        self.assertEqual(self.calls, 1)
+        serial = parameter_shift_gradients_serial(lambda x: float(self.energy_batch(x)[0]), p)
+        np.testing.assert_allclose(g, serial, atol=1e-12)
+        np.testing.assert_allclose(g, self.exact_grad(p), atol=1e-12)
+        self.assertAlmostEqual(E, float(self.energy_batch(p)[0]))
+
+    def test_spsa_and_varqite(self):
+        p = np.random.default_rng(1).uniform(-np.pi, np.pi, 4)
+        g = spsa_gradients(self.energy_batch, p, np.random.default_rng(2), c=1e-4, n_samples=4000)
+        self.assertEqual(self.calls, 1)
+        np.testing.assert_allclose(g, self.exact_grad(p), atol=0.2)
+
+        _, energies = run_varqite(None, N=2, layers=1, steps=30, dtau=0.5, seed=3,
+                                  energy_batch=self.energy_batch, verbose=False)
+        self.assertLess(energies[-1], energies[0])
+
+
+class TestPipelinedMTS(unittest.TestCase):
+    barker13 = "0000011001010"  # +++++--++-+-+, E = 6
+
+    def test_batches_stream_into_population(self):
+        """Verify: finished sample batches are absorbed while MTS runs"""
+        sources = [{self.barker13: 5}, lambda: {"1" * 13: 2, self.barker13: 1}]
+        res = mts_pipelined(13, sources, pop_size=8, mts_iters=40, tabu_iters=50,
+                            seed=0, verbose_every=0)
+        self.assertEqual(res["pending_batches"], 0)
+        self.assertEqual([b["n_samples"] for b in res["sample_batches"]], [1, 2])
+        self.assertEqual(res["sample_batches"][0]["best_sample_E"], 6)
+        self.assertEqual(res["best_E"], 6)
+        self.assertEqual(res["population_E"].tolist(), labs_energy_batch(res["population_pm1"]).tolist())
+
+    def test_does_not_wait_for_slow_batches(self):
+        release = threading.Event()
+        res = mts_pipelined(11, [lambda: release.wait(10) and {"0" * 11: 1}], pop_size=8,
+                            mts_iters=5, tabu_iters=20, seed=1, verbose_every=0)
+        release.set()
+        self.assertEqual(res["pending_batches"], 1)
+        self.assertEqual(len(res["best_trace"]), 6)
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_tts_pipeline_and_files(self):
+        """Verify: TTS records hit the known optimum, summary / fit / files round-trip"""
+        with tempfile.TemporaryDirectory() as d:
+            store = os.path.join(d, "labs.sqlite")
+            sources = {"random": None,
+                       "seeded": lambda N, seed: random_pop(np.random.default_rng(seed), 4, N)}
+            records = run_tts_benchmark((8, 10, 12), seeds=range(3), sources=sources,
+                                        mts_kwargs={"pop_size": 8, "tabu_iters": 100},
+                                        store_path=store, verbose=False)
+            self.assertEqual(len(records), 18)
+            for r in records:
+                self.assertTrue(r["hit"])
+                self.assertEqual(r["best_E"], KNOWN_OPTIMA[r["N"]])
+
+            summary = summarize(records)
+            self.assertEqual([(r["N"], r["source"]) for r in summary][:2], [(8, "random"), (8, "seeded")])
+            self.assertTrue(all(r["success_rate"] == 1.0 for r in summary))
+            fit = fit_scaling(summary, "random", key="mean_iters")
+            self.assertEqual(fit["Ns"], [8, 10, 12])
+
+            doc = write_results(os.path.join(d, "run"), records, summary)
+            with open(os.path.join(d, "run.csv")) as f:
+                self.assertEqual(len(f.readlines()), 19)
+            rows = compare_results(os.path.join(d, "run.json"), doc, key="runs")
+            self.assertEqual({r["speedup"] for r in rows}, {1.0})
+
+    def test_no_hits_write_strict_json(self):
+        """Verify: a group with no hits gets tts99_sec = null, not the non-JSON Infinity"""
+        miss = {"N": 20, "source": "random", "seed": 0, "target_E": 26, "best_E": 30, "hit": False,
+                "iters_to_target": None, "time_to_target_sec": None, "elapsed_sec": 0.5}
+        with tempfile.TemporaryDirectory() as d:
+            write_results(os.path.join(d, "run"), [miss, dict(miss, seed=1)])
+            with open(os.path.join(d, "run.json")) as f:
+                def reject(token):
+                    raise ValueError(token)
+                doc = json.loads(f.read(), parse_constant=reject)
+        self.assertEqual(doc["summary"][0]["success_rate"], 0.0)
+        self.assertIsNone(doc["summary"][0]["tts99_sec"])
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_stats_do_not_change_the_run(self):
+        """Verify: instrumented MTS == plain MTS; counters add up; trace file written"""
+        stats = MTSStats(diversity_every=5)
+        kw = dict(pop_size=8, mts_iters=20, tabu_iters=50, candidate_size=8, seed=5, verbose_every=0)
+        a = mts_quant1(24, stats=stats, **kw)
+        b = mts_quant1(24, **kw)
+        self.assertEqual(a["best_trace"].tolist(), b["best_trace"].tolist())
+        self.assertEqual(a["population_pm1"].tolist(), b["population_pm1"].tolist())
+
+        rep = stats.report()
+        c = rep["counters"]
+        self.assertEqual((c["tabu_runs"], c["tabu_iters"], c["moves_evaluated"]), (20, 1000, 8000))
+        self.assertEqual(c["replacements"], sum(r["replaced"] for r in stats.runs))
+        self.assertEqual([d["it"] for d in rep["diversity"]], [0, 5, 10, 15, 20])
+        with tempfile.TemporaryDirectory() as d:
+            doc = stats.write_trace(os.path.join(d, "trace.json"))
+            self.assertEqual(len(doc["runs"]), 20)
+
+    def test_population_diversity(self):
+        pop = np.array([[1, 1, 1, 1], [1, 1, -1, -1], [1, 1, 1, 1]], dtype=np.int8)
+        div = population_diversity(pop)
+        self.assertAlmostEqual(div["mean_hamming"], (0 + 2 + 2) / 3 / 4)
+        self.assertAlmostEqual(div["unique_frac"], 2 / 3)
+
+
+class TestBitPack(unittest.TestCase):
+    def test_packed_correlations_match_direct(self):
+        """Verify: XOR/popcount correlations == direct path, across word boundaries"""
+        rng = np.random.default_rng(10)
+        for N in [2, 7, 63, 64, 65, 130]:
+            S = random_pop(rng, 30, N)
+            P = pack_pm1(S)
+            self.assertEqual(P.shape, (30, -(-N // 64)))
+            np.testing.assert_array_equal(unpack_pm1(P, N), S)
+            np.testing.assert_array_equal(labs_correlations_batch(S, method="packed"),
+                                          labs_correlations_batch(S, method="direct"))
+
+    def test_flips_and_energies(self):
+        rng = np.random.default_rng(11)
+        s = random_pop(rng, 1, 70)[0]
+        P = pack_pm1(s)
+        expected = []
+        for j in range(70):
+            t = s.copy()
+            t[j] = -t[j]
+            expected.append(labs_energy(t))
+        self.assertEqual(packed_flip_energies(P[0], 70).tolist(), expected)
+        packed_flip(P, 66)
+        self.assertEqual(int(unpack_pm1(P, 70)[0, 66]), -int(s[66]))
+
+        for N in [2, 13, 63, 64, 65, 128, 129]:
+            S = random_pop(rng, 50, N)
+            self.assertEqual(packed_energy(pack_pm1(S), N).tolist(), labs_energy_batch(S).tolist())
+
+
+class TestJitEngine(unittest.TestCase):
+    def test_kernel_bit_identical_to_python(self):
+        """Verify: tabu kernel (uncompiled) == tabu_search_pm1, incl. RNG state afterwards"""
+        rng = np.random.default_rng(12)
+        for N, cs in [(9, 64), (21, 8), (33, 64), (40, 16)]:
+            s = random_pop(rng, 1, N)[0]
+            full = tabu_search_pm1(s, 120, 15, cs, np.random.default_rng(N))
+            for target in (None, full[1]):  # the second run stops early
+                r1, r2 = np.random.default_rng(N), np.random.default_rng(N)
+                a = tabu_search_pm1(s, 120, 15, cs, r1, target_E=target)
+                b = tabu_search_jit(s, 120, 15, cs, r2, target_E=target, engine="python")
+                self.assertEqual((a[0].tolist(), a[1]), (b[0].tolist(), b[1]))
+                self.assertEqual(r1.random(), r2.random())
+            self.assertEqual(labs_energy_jit(s), labs_energy(s))
+
+    def test_mts_engine_switch(self):
+        kw = dict(pop_size=6, mts_iters=5, tabu_iters=30, seed=2, verbose_every=0)
+        a = mts_quant1(15, **kw)
+        b = mts_quant1(15, tabu_engine="jit", **kw)  # falls back without numba
+        self.assertEqual(a["best_trace"].tolist(), b["best_trace"].tolist())
+
+
+class TestBatchedTabu(unittest.TestCase):
+    def test_lockstep_matches_single_searches(self):
+        """Verify: with no randomness in play (all candidates, no jitter) each row == tabu_search_pm1"""
+        rng = np.random.default_rng(13)
+        for N in (6, 19, 41):
+            S = random_pop(rng, 8, N)
+            best_S, best_E = tabu_search_batch(S, 150, 2, 64, np.random.default_rng(0))
+            for row, s in enumerate(S):
+                s_ref, E_ref = tabu_search_pm1(s, 150, 2, 64, np.random.default_rng(1))
+                self.assertEqual((best_S[row].tolist(), int(best_E[row])), (s_ref.tolist(), E_ref))
+
+    def test_candidates_target_and_mts(self):
+        rng = np.random.default_rng(14)
+        S = random_pop(rng, 16, 25)
+        best_S, best_E = tabu_search_batch(S, 200, 20, 8, rng, target_E=60)
+        self.assertEqual(best_E.tolist(), labs_energy_batch(best_S).tolist())
+        self.assertTrue(np.all(best_E <= labs_energy_batch(S)))
+
+        res = mts_batched(13, pop_size=8, mts_iters=64, tabu_iters=100, batch_size=16,
+                          target_E=6, verbose_every=0)
+        self.assertEqual(res["best_E"], 6)
+        self.assertEqual(len(res["best_trace"]), res["tabu_runs"] + 1)
+
+
+class TestCheckpoint(unittest.TestCase):
+    def test_resume_matches_uninterrupted_run(self):
+        """Verify: run 12 iterations, checkpoint, resume to 30 == one 30-iteration run"""
+        kw = dict(pop_size=8, tabu_iters=60, candidate_size=8, seed=9, verbose_every=0)
+        full = mts_quant1(27, mts_iters=30, **kw)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "mts.npz")
+            first = mts_quant1(27, mts_iters=12, checkpoint_path=path, checkpoint_every=5, **kw)
+            self.assertEqual(len(first["best_trace"]), 13)
+            resumed = resume_mts_quant1(path, mts_iters=30)
+            for key in ("best_trace", "population_pm1", "population_E", "best_s_pm1"):
+                self.assertEqual(resumed[key].tolist(), full[key].tolist(), key)
+            self.assertRaises(ValueError, mts_quant1, 27, pop_size=9, resume_from=path)
+
+    def test_resume_keeps_duplicate_count(self):
+        """Verify: a dedupe run resumed from a checkpoint reports the same duplicates_rejected"""
+        kw = dict(pop_size=8, tabu_iters=60, candidate_size=8, seed=9, verbose_every=0,
+                  dedupe=True, replace_policy="worst")
+        full = mts_quant1(15, mts_iters=40, **kw)
+        self.assertGreater(full["duplicates_rejected"], 0)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "mts.npz")
+            first = mts_quant1(15, mts_iters=20, checkpoint_path=path, checkpoint_every=5, **kw)
+            self.assertGreater(first["duplicates_rejected"], 0)
+            resumed = resume_mts_quant1(path, mts_iters=40)
+            for key in ("best_trace", "population_pm1", "population_E", "duplicates_rejected"):
+                self.assertEqual(np.asarray(resumed[key]).tolist(),
+                                 np.asarray(full[key]).tolist(), key)
+
+
+class TestSkewSymmetric(unittest.TestCase):
+    def test_expand_and_odd_lags(self):
+        rng = np.random.default_rng(15)
+        H = random_pop(rng, 20, 11)
+        S = skew_expand(H)
+        self.assertEqual(S.shape, (20, 21))
+        self.assertTrue(np.all(is_skew_symmetric(S)))
+        self.assertEqual(skew_free_part(S).tolist(), H.tolist())
+        C = labs_correlations_batch(S)
+        self.assertTrue(np.all(C[:, 0::2] == 0))  # odd lags k = 1, 3, ...
+        self.assertEqual(skew_energy_batch(H).tolist(), labs_energy_batch(S).tolist())
+        self.assertRaises(ValueError, skew_expand, np.ones((2, 0), dtype=np.int8))
+        self.assertRaises(ValueError, mts_quant1, 12, skew=True)
+
+    def test_move_deltas_match_brute_force(self):
+        rng = np.random.default_rng(16)
+        for N in (3, 5, 9, 21):
+            s = skew_expand(random_pop(rng, 1, (N + 1) // 2)[0])
+            A, _ = init_flip_table(s)
+            moves = np.arange((N + 1) // 2)
+            dE = skew_move_deltas(s, labs_correlations_pm1(s), A, moves)
+            for i in moves:
+                t = s.copy()
+                t[[i, N - 1 - i]] *= -1  # the centre (i == N-1-i) flips once
+                self.assertEqual(int(dE[i]), labs_energy_pm1(t) - labs_energy_pm1(s))
+
+    def test_search_stays_skew_and_hits_skew_optimum(self):
+        rng = np.random.default_rng(17)
+        s0 = skew_expand(random_pop(rng, 1, 16)[0])
+        best_s, best_E = tabu_search_skew(s0, 200, 10, 8, rng)
+        self.assertTrue(is_skew_symmetric(best_s)[0])
+        self.assertEqual(best_E, labs_energy_pm1(best_s))
+
+        # N = 31 has no skew-symmetric optimum (67 vs 79)
+        for N in (13, 31):
+            skew_E = brute_force_labs_skew(N)[0][1] if N < 20 else skew_optimum(N)["best_E"]
+            self.assertGreaterEqual(skew_E, KNOWN_OPTIMA[N])
+            res = mts_quant1(N, pop_size=8, mts_iters=200, tabu_iters=100, target_E=skew_E,
+                             seed=1, skew=True, verbose_every=0)
+            self.assertEqual(res["best_E"], skew_E)
+            self.assertTrue(np.all(is_skew_symmetric(res["population_pm1"])))
+        self.assertEqual(brute_force_labs_skew(13)[0][1], KNOWN_OPTIMA[13])
+
+    def test_search_stats(self):
+        """Verify: skew search with stats == without; all tabu counters and the delta timer filled"""
+        s0 = skew_expand(random_pop(np.random.default_rng(19), 1, 11)[0])
+        stats = MTSStats()
+        a = tabu_search_skew(s0, 300, 30, 64, np.random.default_rng(3), stats=stats)
+        b = tabu_search_skew(s0, 300, 30, 64, np.random.default_rng(3))
+        self.assertEqual((a[0].tolist(), a[1]), (b[0].tolist(), b[1]))
+        c = stats.counters
+        self.assertEqual((c["tabu_runs"], c["tabu_iters"], c["moves_evaluated"]), (1, 300, 3300))
+        self.assertGreater(c["improving_moves"], 0)
+        self.assertGreater(c["all_tabu_moves"], 0)  # tenure 30 > 11 moves
+        self.assertLessEqual(c["aspiration_moves"] + c["all_tabu_moves"], 300)
+        self.assertGreater(stats.timers["delta"], 0.0)
+
+
+class TestPopulationIndex(unittest.TestCase):
+    def test_canonical_key_matches_orbits(self):
+        """Verify: equal keys <=> same canonical_form (flip / reversal orbit)"""
+        for N in (1, 6, 7):
+            seqs = [s for s, _ in brute_force_labs(N)]
+            keys = {}
+            for s in seqs:
+                keys.setdefault(canonical_key(np.array(s)), set()).add(canonical_form(s))
+            self.assertTrue(all(len(forms) == 1 for forms in keys.values()))
+            self.assertEqual(len(keys), len({canonical_form(s) for s in seqs}))
+
+    def test_heaps_and_dedupe(self):
+        rng = np.random.default_rng(18)
+        pop = random_pop(rng, 40, 15)
+        pop_E = labs_energy_batch(pop).astype(np.int64)
+        results = random_pop(rng, 300, 15)
+
+        # without dedupe the index reproduces insert_result exactly
+        ref_pop, ref_E = pop.copy(), pop_E.copy()
+        idx_pop, idx_E = pop.copy(), pop_E.copy()
+        index = PopulationIndex(idx_pop, idx_E, dedupe=False)
+        r1, r2 = np.random.default_rng(0), np.random.default_rng(0)
+        b1 = b2 = (pop[0], 10**6)
+        for s in results:
+            E = labs_energy_pm1(s)
+            b1 = insert_result(ref_pop, ref_E, *b1, s, E, r1)
+            b2 = index.insert(*b2, s, E, r2)
+            self.assertEqual(index.worst_slot(), int(np.argmax(idx_E)))
+            self.assertEqual(index.best_slot(), int(np.argmin(idx_E)))
+        self.assertEqual(idx_pop.tolist(), ref_pop.tolist())
+
+        index = PopulationIndex(idx_pop, idx_E, dedupe=True, replace="worst")
+        twin = -idx_pop[index.best_slot()][::-1]
+        self.assertIn(twin, index)
+        before = idx_E.copy()
+        index.insert(twin, 0, twin, -1, rng)
+        self.assertEqual(index.rejected, 1)
+        self.assertEqual(idx_E.tolist(), before.tolist())
+        self.assertRaises(ValueError, PopulationIndex, idx_pop, idx_E, replace="oldest")
+
+    def test_mts_keeps_population_distinct(self):
+        res = mts_quant1(21, pop_size=16, mts_iters=150, tabu_iters=100, seed=2, verbose_every=0,
+                         dedupe=True, replace_policy="worst", tournament_size=2)
+        keys = {canonical_key(s) for s in res["population_pm1"]}
+        self.assertEqual(len(keys), 16)
+        self.assertEqual(res["population_E"].tolist(), labs_energy_batch(res["population_pm1"]).tolist())
+        self.assertEqual(res["best_E"], int(res["population_E"].min()))
+
+
+class TestStatevectorSim(unittest.TestCase):
+    def test_fusion_matches_gate_by_gate(self):
+        rng = np.random.default_rng(19)
+        G2, G4 = (G.tolist() for G in get_interactions(6, None))
+        circuits = [
+            sv.mps_ansatz(5, 2, rng.uniform(-np.pi, np.pi, 10)),
+            sv.trotterized_circuit(6, G2, G4, 2, 0.5, 1.0, [0.3, 0.7]),
+        ]
+        for c in circuits:
+            ref = sv.simulate(c, max_fused=0)
+            self.assertAlmostEqual(float(np.linalg.norm(ref)), 1.0)
+            for k in (1, 2, 3, 4):
+                self.assertLess(len(sv.fuse(c.ops, k)), len(c.ops))
+                np.testing.assert_allclose(sv.simulate(c, max_fused=k), ref, atol=1e-12)
+
+    def test_gates(self):
+        c = sv.Circuit(2)
+        sv.rzz(c, 0, 1, 0.7)
+        (_, U), = sv.fuse(c.ops)
+        np.testing.assert_allclose(U, np.diag(np.exp(-0.35j * np.array([1, -1, -1, 1]))), atol=1e-12)
+
+        c = sv.prepare_state([1, 0, 0])
+        c.cx(0, 2)
+        c.ry(np.pi, 1)
+        self.assertEqual(sv.sample(c, 50, seed=0), {"111": 50})
+
+        psi = sv.simulate(sv.mps_ansatz(3, 0, []))
+        np.testing.assert_allclose(psi, np.full(8, 8**-0.5), atol=1e-12)
+
+    def test_observe_and_sample(self):
+        rng = np.random.default_rng(20)
+        terms = labs_hamiltonian_terms(8)
+        for bits in rng.integers(0, 2, size=(5, 8)):
+            self.assertAlmostEqual(sv.observe(sv.prepare_state(bits.tolist()), terms),
+                                   float(diagonal_energies(bits)[0]))
+
+        N = 6
+        params = rng.uniform(-np.pi, np.pi, 2 * N)
+        probs = np.abs(sv.simulate(sv.mps_ansatz(N, 2, params)))**2
+        states = (np.arange(2**N)[:, None] >> np.arange(N - 1, -1, -1)) & 1
+        exact = float(probs @ diagonal_energies(states))
+        self.assertAlmostEqual(sv.observe(sv.mps_ansatz(N, 2, params), labs_hamiltonian_terms(N)), exact)
+
+        counts = sv.sample(sv.mps_ansatz(N, 2, params), 2000, seed=1)
+        self.assertEqual(sum(counts.values()), 2000)
+        self.assertEqual(len(counts_to_population(counts)), 2000)
+
+        batch = observe_batch(sv.mps_ansatz, labs_hamiltonian_terms(N), N, 2,
+                              [params, -params], mode="local")
+        self.assertAlmostEqual(batch[0], exact)
+        _, energies = run_varqite(sv.mps_ansatz, 4, 1, steps=3, observe_mode="local",
+                                  hamiltonian=diagonal_vector(4, None), seed=0, verbose=False)
+        self.assertTrue(np.all(np.isfinite(energies)))
+
+    def test_term_path_matches_diagonal_at_n20(self):
+        N = 20
+        params = np.random.default_rng(24).uniform(-np.pi, np.pi, 2 * N)
+        c = sv.mps_ansatz(N, 2, params)
+        self.assertAlmostEqual(sv.observe(c, labs_hamiltonian_terms(N)),
+                               sv.observe(c, build_diagonal(N)), places=6)
+
+
+class TestDiagonalVector(unittest.TestCase):
+    def test_matches_term_evaluation(self):
+        N = 7
+        states = (np.arange(2**N)[:, None] >> np.arange(N - 1, -1, -1)) & 1
+        diag = build_diagonal(N)
+        self.assertEqual(diag.tolist(), diagonal_energies(states).tolist())
+        # qubit 0 as least significant bit gives the same vector (E is reversal-invariant)
+        self.assertEqual(diag.tolist(), diagonal_energies(states[:, ::-1]).tolist())
+
+        params = np.random.default_rng(21).uniform(-np.pi, np.pi, 2 * N)
+        c = sv.mps_ansatz(N, 2, params)
+        self.assertAlmostEqual(sv.observe(c, diag), sv.observe(c, labs_hamiltonian_terms(N)))
+
+        counts = sv.sample(c, 500, seed=3)
+        E, shots = counts_energies(counts, diag)
+        S = counts_to_population(counts, dedupe=True)
+        self.assertEqual(sorted(E.tolist()), sorted(labs_energy_batch(S).tolist()))
+        self.assertEqual(int(shots.sum()), 500)
+
+    def test_disk_cache_is_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as d:
+            first = diagonal_vector(9, d)
+            self.assertTrue(os.path.exists(os.path.join(d, "labs_diagonal_N9.npy")))
+            diagonal_vector.cache_clear()
+            again = diagonal_vector(9, d)
+            self.assertIsInstance(again, np.memmap)
+            self.assertFalse(again.flags.writeable)
+            self.assertEqual(np.asarray(again).tolist(), build_diagonal(9).tolist())
+            self.assertEqual(np.asarray(first).tolist(), np.asarray(again).tolist())
+            del first, again
+            diagonal_vector.cache_clear()
+
+
+class TestMPSSim(unittest.TestCase):
+    def test_mpo_matches_diagonal(self):
+        for N in (2, 3, 6, 8):
+            Ws = mps_sim.labs_mpo(N)
+            diag = build_diagonal(N)
+            for idx in range(2**N):
+                v = np.ones(1)
+                for q, W in enumerate(Ws):
+                    v = v @ W[:, :, (idx >> (N - 1 - q)) & 1]
+                self.assertEqual(v.tolist(), [float(diag[idx])])
+
+    def test_exact_and_truncated_states(self):
+        rng = np.random.default_rng(22)
+        N = 8
+        c = sv.mps_ansatz(N, 3, rng.uniform(-np.pi, np.pi, 3 * N))
+        c.cx(5, 4)
+        ref = sv.simulate(c)
+        mps = mps_sim.simulate_mps(c)
+        self.assertEqual(mps.truncation_error, 0.0)
+        np.testing.assert_allclose(mps.to_statevector(), ref, atol=1e-10)
+        self.assertAlmostEqual(mps.labs_energy(), sv.observe(c, build_diagonal(N)))
+
+        small = mps_sim.simulate_mps(c, max_bond=2)
+        self.assertLessEqual(max(small.bond_dims), 2)
+        self.assertGreater(small.truncation_error, 0.0)
+        self.assertAlmostEqual(small.norm(), 1.0)
+
+        far = sv.Circuit(3)
+        far.cx(0, 2)
+        self.assertRaises(ValueError, mps_sim.simulate_mps, far)
+
+    def test_sampling(self):
+        rng = np.random.default_rng(23)
+        N = 6
+        c = sv.mps_ansatz(N, 2, rng.uniform(-np.pi, np.pi, 2 * N))
+        probs = np.abs(sv.simulate(c))**2
+        bits = mps_sim.simulate_mps(c).sample(20000, seed=4)
+        idx = bits.astype(np.int64) @ (1 << np.arange(N - 1, -1, -1))
+        tv = 0.5 * np.abs(np.bincount(idx, minlength=2**N) / 20000 - probs).sum()
+        self.assertLess(tv, 0.03)
+
+        # N beyond statevector reach: MPO energy vs the mean energy of direct samples
+        N = 60
+        params = rng.uniform(-np.pi, np.pi, 2 * N)
+        mps = mps_sim.simulate_mps(sv.mps_ansatz(N, 2, params), max_bond=8)
+        E = labs_energy_batch(1 - 2 * mps.sample(4000, seed=5))
+        self.assertLess(abs(mps.labs_energy() - E.mean()), 5 * E.std() / np.sqrt(len(E)))
+
+        pop = mps_sim.sample_population_mps(N, 2, params, 16, max_bond=8, seed=6)
+        self.assertEqual(pop.shape, (16, N))
+        res = mts_quant1(N, pop_size=16, initial_pop=pop, mts_iters=5, tabu_iters=20,
+                         verbose_every=0)
+        self.assertLessEqual(res["best_E"], int(labs_energy_batch(pop).min()))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
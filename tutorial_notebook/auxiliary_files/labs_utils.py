@@ -25,6 +25,75 @@ def compute_topology_overlaps(G2, G4):
 
 from math import sin, cos, pi
 
+
+class ThetaSchedule:
+    """
+    Everything in theta(t) that depends only on (N, G2, G4): |G2|, |G4|, the
+    topology invariants and Gamma1. thetas() then evaluates the whole
+    Trotter schedule in one vectorized pass.
+    """
+
+    def __init__(self, N, G2, G4):
+        self.N = N
+        self.n_g2 = len(G2)
+        self.n_g4 = len(G4)
+        self.I_vals = compute_topology_overlaps(G2, G4)
+        # Gamma 1 (Eq 16): 16 * Sum_G2(S_x=2) + 64 * Sum_G4(S_x=4)
+        self.Gamma1 = 16 * self.n_g2 * 2 + 64 * self.n_g4 * 4
+
+    def thetas_at(self, t, dt, total_time):
+        """theta for every time in t (array-like); same formula as compute_theta."""
+        t = np.asarray(t, dtype=float)
+        if total_time == 0:
+            return np.zeros_like(t)
+
+        # lambda(t) = sin^2(pi * t / 2T), lambda_dot(t) = (pi / 2T) * sin(pi * t / T)
+        lam = np.sin((np.pi * t) / (2.0 * total_time))**2
+        lam_dot = (np.pi / (2.0 * total_time)) * np.sin((np.pi * t) / total_time)
+
+        # Gamma 2 (Eq 17)
+        sum_G2 = self.n_g2 * (lam**2 * 2)
+        sum_G4 = 4 * self.n_g4 * (16 * (lam**2) + 8 * ((1 - lam)**2))
+        I = self.I_vals
+        term_topology = 4 * (lam**2) * (4 * I['24'] + I['22']) + 64 * (lam**2) * I['44']
+        Gamma2 = -256 * (term_topology + sum_G2 + sum_G4)
+
+        small = np.abs(Gamma2) < 1e-12
+        alpha = np.where(small, 0.0, -self.Gamma1 / np.where(small, 1.0, Gamma2))
+        return dt * alpha * lam_dot
+
+    def thetas(self, n_steps, dt, total_time):
+        """Thetas for t = dt, 2dt, ..., n_steps*dt (the notebook's Trotter steps)."""
+        return self.thetas_at(dt * np.arange(1, n_steps + 1), dt, total_time)
+
+
+_SCHEDULES = {}  # (N, G2 bytes, G4 bytes) -> ThetaSchedule
+_BY_ID = {}      # (N, |G2|, |G4|, id(G2), id(G4)) -> (G2, G4, ThetaSchedule)
+
+def get_theta_schedule(N, G2, G4):
+    """
+    ThetaSchedule for (N, G2, G4). Repeat calls with the same list objects
+    (every Trotter step of compute_theta) are a dict lookup; otherwise the
+    contents are compared, so equal lists share one schedule. Don't mutate
+    G2 / G4 in place after passing them in.
+    """
+    id_key = (N, len(G2), len(G4), id(G2), id(G4))
+    hit = _BY_ID.get(id_key)
+    if hit is not None and hit[0] is G2 and hit[1] is G4:
+        return hit[2]
+
+    key = (N,) + tuple(np.asarray(G, dtype=np.int64).tobytes() for G in (G2, G4))
+    sched = _SCHEDULES.get(key)
+    if sched is None:
+        if len(_SCHEDULES) >= 32:
+            _SCHEDULES.pop(next(iter(_SCHEDULES)))
+        sched = _SCHEDULES[key] = ThetaSchedule(N, G2, G4)
+    if len(_BY_ID) >= 32:
+        _BY_ID.pop(next(iter(_BY_ID)))
+    _BY_ID[id_key] = (G2, G4, sched)  # holding G2 / G4 keeps their ids from being reused
+    return sched
+
+
 def compute_theta(t, dt, total_time, N, G2, G4):
     """
     Computes theta(t) using the analytical solutions for Gamma1 and Gamma2.
@@ -66,7 +135,7 @@ def compute_theta(t, dt, total_time, N, G2, G4):
     sum_G4 = 4 * len(G4) * (16 * (lam**2) + 8 * ((1 - lam)**2))
     
     # Topology part
-    I_vals = compute_topology_overlaps(G2, G4)
+    I_vals = get_theta_schedule(N, G2, G4).I_vals
     term_topology = 4 * (lam**2) * (4 * I_vals['24'] + I_vals['22']) + 64 * (lam**2) * I_vals['44']
     
     # Combine Gamma 2